@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script for batch line-item validation.
+Checks result ordering, input validation and that the process-pool path
+returns exactly what serial validation does.
+"""
+
+import copy
+import sys
+from pathlib import Path
+
+# Add the current directory to the path
+sys.path.append(str(Path(__file__).parent))
+
+from tool_library.line_item_validation_tool import (
+    PARALLEL_BATCH_THRESHOLD, validate_line_items, validate_line_items_batch
+)
+from tool_library.po_contract_resolver_tool import resolve_invoice_to_po_and_contract
+
+REPO_ROOT = str(Path(__file__).parent)
+INVOICES_DIR = Path(__file__).parent / "json_files" / "golden_invoices"
+
+
+def _load_pairs():
+    """(invoice, po_item) pairs for every golden invoice that resolves to a PO."""
+    pairs = []
+    for path in sorted(INVOICES_DIR.glob("*.json")):
+        outcome = resolve_invoice_to_po_and_contract(str(path), repo_root=REPO_ROOT)
+        if isinstance(outcome["invoice"], dict) and isinstance(outcome["po_item"], dict):
+            pairs.append((outcome["invoice"], outcome["po_item"]))
+    assert pairs, "no golden invoice resolved to a PO"
+    return pairs
+
+
+def _failing_pairs(pairs):
+    """Copies of pairs whose first invoice line overbills the PO, so validation fails."""
+    failing = []
+    for invoice, po_item in pairs:
+        invoice = copy.deepcopy(invoice)
+        line = invoice["line_items"][0]
+        line["unit_price"] = line["unit_price"] + 10
+        line["quantity"] = line["quantity"] + 1
+        failing.append((invoice, po_item))
+    return failing
+
+
+def test_batch_preserves_order():
+    """Serial batches return one result per pair, in input order."""
+    print("🧪 Testing batch result ordering...")
+    base = _load_pairs()
+    pairs = base + _failing_pairs(base)
+    invoices = [invoice for invoice, _ in pairs]
+    po_items = [po_item for _, po_item in pairs]
+    
+    results = validate_line_items_batch(invoices, po_items)
+    
+    assert len(results) == len(pairs)
+    assert {result["status"] for result in results} == {"PASS", "FAIL"}
+    assert results == [validate_line_items(invoice, po_item) for invoice, po_item in pairs]
+    print(f"✅ {len(results)} results returned in input order")
+
+
+def test_batch_length_mismatch():
+    """Different numbers of invoices and PO items are rejected."""
+    print("\n🧪 Testing batch length mismatch...")
+    invoice, po_item = _load_pairs()[0]
+    try:
+        validate_line_items_batch([invoice, invoice], [po_item])
+    except ValueError:
+        print("✅ ValueError raised for mismatched lengths")
+    else:
+        raise AssertionError("expected ValueError for mismatched lengths")
+
+
+def test_batch_parallel_matches_serial():
+    """Batches above PARALLEL_BATCH_THRESHOLD (process pool) match serial validation."""
+    print("\n🧪 Testing parallel vs serial batch results...")
+    base = _load_pairs()
+    base = base + _failing_pairs(base)
+    pairs = (base * (PARALLEL_BATCH_THRESHOLD // len(base) + 2))[:PARALLEL_BATCH_THRESHOLD + 5]
+    invoices = [invoice for invoice, _ in pairs]
+    po_items = [po_item for _, po_item in pairs]
+    
+    parallel = validate_line_items_batch(invoices, po_items, max_workers=2)
+    serial = [validate_line_items(invoice, po_item) for invoice, po_item in pairs]
+    
+    assert len(parallel) == len(pairs)
+    assert parallel == serial
+    print(f"✅ {len(parallel)} parallel results match serial validation")
+
+
+def main():
+    """Run all batch validation tests."""
+    tests = [
+        ("Batch Ordering", test_batch_preserves_order),
+        ("Batch Length Mismatch", test_batch_length_mismatch),
+        ("Parallel vs Serial", test_batch_parallel_matches_serial),
+    ]
+    
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✅ {test_name} PASSED")
+        except Exception as e:
+            print(f"❌ {test_name} FAILED: {e}")
+    
+    print(f"\n📊 Test Results: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
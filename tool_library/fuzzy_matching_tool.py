@@ -1,10 +1,40 @@
+import atexit
+import functools
+import heapq
 import json
+import multiprocessing
 import os
-import re
-from typing import Any, Dict, List, Optional, Tuple, Union
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice, repeat
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from difflib import SequenceMatcher
 
+from .po_contract_resolver_tool import (
+    resolve_directories, find_invoice_path, read_json_file, _read_json_shared,
+    find_contract_by_id, normalize_token
+)
 
+# Candidate count above which similarity scoring is fanned out to worker
+# processes; below it the pool start-up and pickling cost outweighs the gain.
+PARALLEL_SCORING_THRESHOLD = 2000
+
+# PO candidates are pulled from their source in batches of this size, so a
+# large PO corpus is never held in memory all at once.
+SCORING_BATCH_SIZE = 8 * PARALLEL_SCORING_THRESHOLD
+
+# Upper bound on the number of PO matches retained for all_matches.
+MAX_PO_MATCHES = 50
+
+_SCORE_POOL: Optional[ProcessPoolExecutor] = None
+_SCORE_POOL_LOCK = threading.Lock()
+
+# Folds "_" into "-" so separator runs can be collapsed without a regex
+_SEPARATOR_TABLE = str.maketrans("_", "-")
+
+
+@functools.lru_cache(maxsize=4096)
 def normalize_for_fuzzy(value: Optional[str]) -> str:
     """
     Normalize a string for fuzzy matching by:
@@ -16,14 +46,17 @@ def normalize_for_fuzzy(value: Optional[str]) -> str:
     if not value:
         return ""
     
-    # Convert to uppercase and strip whitespace
-    normalized = value.upper().strip()
+    # Plain alphanumeric identifiers have nothing to rewrite
+    if value.isalnum():
+        return value.upper()
     
-    # Replace multiple spaces with single space
-    normalized = re.sub(r'\s+', ' ', normalized)
+    # Uppercase, strip, and collapse whitespace runs to a single space
+    normalized = " ".join(value.upper().split())
     
-    # Standardize common separators (keep them for better matching)
-    normalized = re.sub(r'[-_]+', '-', normalized)
+    # Standardize common separators: any run of "-"/"_" becomes a single "-"
+    normalized = normalized.translate(_SEPARATOR_TABLE)
+    while "--" in normalized:
+        normalized = normalized.replace("--", "-")
     
     return normalized
 
@@ -50,66 +83,264 @@ def calculate_similarity(str1: str, str2: str) -> float:
     return similarity
 
 
-def find_best_po_match(invoice_po: str, po_candidates: List[Dict[str, Any]], min_confidence: float = 0.7) -> Dict[str, Any]:
+def _damerau_levenshtein_distance(a: str, b: str) -> int:
+    """
+    Unrestricted Damerau-Levenshtein distance (insertions, deletions,
+    substitutions and transpositions of adjacent characters each cost 1).
+    """
+    # A shared prefix or suffix never costs an edit, so only the differing
+    # middle goes through the DP; for near-identical IDs that is a few chars
+    start = 0
+    end_a, end_b = len(a), len(b)
+    while start < end_a and start < end_b and a[start] == b[start]:
+        start += 1
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a = a[start:end_a]
+    b = b[start:end_b]
+    len_a, len_b = len(a), len(b)
+    if not len_a or not len_b:
+        return len_a + len_b
+
+    max_dist = len_a + len_b
+    # Row/column 0 hold the sentinel, row/column 1 the empty-prefix distances
+    d = [[max_dist] * (len_b + 2) for _ in range(len_a + 2)]
+    d[1] = [max_dist] + list(range(len_b + 1))
+    for i in range(len_a + 1):
+        d[i + 1][1] = i
+
+    last_row: Dict[str, int] = {}
+    for i in range(1, len_a + 1):
+        char_a = a[i - 1]
+        prev_row = d[i]
+        row = d[i + 1]
+        last_match_col = 0
+        for j in range(1, len_b + 1):
+            char_b = b[j - 1]
+            k = last_row.get(char_b, 0)
+            l = last_match_col
+            if char_a == char_b:
+                cost = 0
+                last_match_col = j
+            else:
+                cost = 1
+            row[j + 1] = min(
+                prev_row[j] + cost,                          # substitution
+                row[j] + 1,                                  # insertion
+                prev_row[j + 1] + 1,                         # deletion
+                d[k][l] + (i - k - 1) + 1 + (j - l - 1),     # transposition
+            )
+        last_row[char_a] = i
+    return d[len_a + 1][len_b + 1]
+
+
+def calculate_id_similarity(str1: str, str2: str) -> float:
+    """
+    Calculate similarity between two short identifiers (e.g. PO numbers) as
+    normalized Damerau-Levenshtein similarity: 1 - distance / longer length.
+    Unlike SequenceMatcher, a typo or a pair of transposed characters costs
+    exactly one edit, which is how identifiers are usually mistyped.
+    Returns a float between 0.0 and 1.0 (higher = more similar).
+    """
+    if not str1 or not str2:
+        return 0.0
+    
+    norm1 = normalize_for_fuzzy(str1)
+    norm2 = normalize_for_fuzzy(str2)
+    if norm1 == norm2:
+        return 1.0
+    
+    return 1.0 - _damerau_levenshtein_distance(norm1, norm2) / max(len(norm1), len(norm2))
+
+
+def _get_score_pool() -> ProcessPoolExecutor:
+    global _SCORE_POOL
+    with _SCORE_POOL_LOCK:
+        if _SCORE_POOL is None:
+            # Spawned, not forked: callers such as triage score while other threads run,
+            # and forking a multi-threaded process can deadlock the child
+            _SCORE_POOL = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("spawn"))
+        return _SCORE_POOL
+
+
+def _discard_score_pool(pool: ProcessPoolExecutor) -> None:
+    # A broken pool stays broken; drop it so the next large scoring starts a new one
+    global _SCORE_POOL
+    with _SCORE_POOL_LOCK:
+        if _SCORE_POOL is pool:
+            _SCORE_POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _shutdown_score_pool() -> None:
+    global _SCORE_POOL
+    with _SCORE_POOL_LOCK:
+        pool, _SCORE_POOL = _SCORE_POOL, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(_shutdown_score_pool)
+
+
+def _score_name_chunk(query: str, candidates: List[str]) -> List[float]:
+    """
+    Equivalent to calculate_similarity(query, c) for every candidate, but the
+    query is normalized once. It stays in seq1 (as in calculate_similarity) so
+    scores are identical; ratio() is not strictly symmetric in its inputs.
+    """
+    if not query:
+        return [0.0] * len(candidates)
+    norm_query = normalize_for_fuzzy(query)
+    matcher = SequenceMatcher(None, norm_query)
+    scores: List[float] = []
+    for candidate in candidates:
+        if not candidate:
+            scores.append(0.0)
+            continue
+        norm_candidate = normalize_for_fuzzy(candidate)
+        if norm_candidate == norm_query:
+            scores.append(1.0)
+        else:
+            matcher.set_seq2(norm_candidate)
+            scores.append(matcher.ratio())
+    return scores
+
+
+def _score_id_chunk(query: str, candidates: List[str]) -> List[float]:
+    return [calculate_id_similarity(query, candidate) for candidate in candidates]
+
+
+def _score_candidates(
+    query: str,
+    candidates: List[str],
+    score_chunk: Callable[[str, List[str]], List[float]] = _score_name_chunk
+) -> List[float]:
+    """
+    Score query against every candidate string, preserving candidate order.
+    Large candidate lists are split into one chunk per CPU and scored in a
+    process pool (the scorers are pure Python, so threads would not help).
+    """
+    if len(candidates) <= PARALLEL_SCORING_THRESHOLD:
+        return score_chunk(query, candidates)
+
+    workers = os.cpu_count() or 1
+    size = -(-len(candidates) // workers)
+    chunks = [candidates[i:i + size] for i in range(0, len(candidates), size)]
+    pool = None
+    try:
+        pool = _get_score_pool()
+        scored = pool.map(score_chunk, repeat(query), chunks)
+        return [score for chunk in scored for score in chunk]
+    except (BrokenProcessPool, OSError):
+        # Pool unavailable (e.g. sandboxed runtime) or a worker died - score serially.
+        # Errors raised by score_chunk itself propagate as they would serially.
+        if pool is not None:
+            _discard_score_pool(pool)
+        return score_chunk(query, candidates)
+
+
+def find_best_po_match(
+    invoice_po: str,
+    po_candidates: Iterable[Dict[str, Any]],
+    min_confidence: float = 0.7,
+    top_k: int = MAX_PO_MATCHES
+) -> Dict[str, Any]:
     """
-    Find the best matching PO from candidates using fuzzy matching.
+    Find the best matching PO from candidates using fuzzy matching
+    (Damerau-Levenshtein similarity, see calculate_id_similarity).
+    
+    Candidates are consumed in batches, so po_candidates may be a generator
+    (see iter_po_candidates); only the top_k highest scoring matches are kept.
+    An exact match (after normalization) ends the search early, so later
+    candidates are neither scored nor reported.
     
     Args:
         invoice_po: PO number from invoice
-        po_candidates: List of PO items to match against
+        po_candidates: Iterable of PO items to match against
         min_confidence: Minimum confidence threshold (0.0 to 1.0)
+        top_k: Maximum number of matches reported in all_matches
     
     Returns:
         Dict with match details and confidence score
     """
-    if not invoice_po or not po_candidates:
-        return {
-            "match": None,
-            "confidence": 0.0,
-            "reasoning": "No PO number or candidates provided",
-            "variations": []
-        }
-    
-    best_match = None
-    best_confidence = 0.0
-    all_matches = []
-    
-    for po_item in po_candidates:
-        po_number = po_item.get("po_number", "")
-        confidence = calculate_similarity(invoice_po, po_number)
-        
-        match_info = {
-            "po_item": po_item,
-            "po_number": po_number,
-            "confidence": confidence,
-            "normalized_invoice": normalize_for_fuzzy(invoice_po),
-            "normalized_po": normalize_for_fuzzy(po_number)
-        }
+    no_candidates = {
+        "match": None,
+        "confidence": 0.0,
+        "reasoning": "No PO number or candidates provided",
+        "variations": []
+    }
+    if not invoice_po:
+        return no_candidates
+    
+    # Min-heap of (confidence, -index, po_number, po_item); the negated index
+    # makes the earliest candidate win ties, as with a plain max() scan
+    top: List[Tuple[float, int, str, Dict[str, Any]]] = []
+    normalized_invoice = normalize_for_fuzzy(invoice_po)
+    index = 0
+    candidates = iter(po_candidates)
+    while True:
+        batch = list(islice(candidates, SCORING_BATCH_SIZE))
+        if not batch:
+            break
+        po_numbers = [po_item.get("po_number", "") for po_item in batch]
         
-        all_matches.append(match_info)
+        # Most invoices quote their PO number exactly (after normalization);
+        # nothing can beat that, so stop without scoring the rest
+        exact = next((i for i, n in enumerate(po_numbers)
+                      if normalized_invoice and normalize_for_fuzzy(n) == normalized_invoice), None)
+        if exact is not None:
+            entry = (1.0, -(index + exact), po_numbers[exact], batch[exact])
+            if len(top) < top_k:
+                heapq.heappush(top, entry)
+            else:
+                heapq.heapreplace(top, entry)
+            break
         
-        if confidence > best_confidence:
-            best_confidence = confidence
-            best_match = po_item
-    
-    # Filter matches above minimum confidence
-    valid_matches = [m for m in all_matches if m["confidence"] >= min_confidence]
+        confidences = _score_candidates(invoice_po, po_numbers, _score_id_chunk)
+        for po_item, po_number, confidence in zip(batch, po_numbers, confidences):
+            entry = (confidence, -index, po_number, po_item)
+            if len(top) < top_k:
+                heapq.heappush(top, entry)
+            elif entry[:2] > top[0][:2]:
+                heapq.heapreplace(top, entry)
+            index += 1
+    if not top:
+        return no_candidates
+    
+    best_confidence, _, _, best_item = max(top, key=lambda e: e[:2])
+    best_match = best_item if best_confidence > 0.0 else None
+    
+    # Report the retained matches in candidate order
+    kept = sorted(top, key=lambda e: -e[1])
+    
+    def match_info(entry: Tuple[float, int, str, Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "po_item": entry[3],
+            "po_number": entry[2],
+            "confidence": entry[0]
+        }
     
     if best_match and best_confidence >= min_confidence:
+        # Filter matches above minimum confidence
+        valid_matches = [e for e in kept if e[0] >= min_confidence]
         return {
             "match": best_match,
             "confidence": best_confidence,
             "reasoning": f"Best match found with {best_confidence:.1%} confidence",
-            "variations": [m["po_number"] for m in valid_matches],
-            "all_matches": valid_matches
+            "normalized_invoice": normalized_invoice,
+            "variations": [e[2] for e in valid_matches],
+            "all_matches": [match_info(e) for e in valid_matches]
         }
     else:
         return {
             "match": None,
             "confidence": best_confidence,
             "reasoning": f"No matches above {min_confidence:.1%} threshold. Best was {best_confidence:.1%}",
+            "normalized_invoice": normalized_invoice,
             "variations": [],
-            "all_matches": all_matches
+            "all_matches": [match_info(e) for e in kept]
         }
 
 
@@ -136,15 +367,16 @@ def find_best_supplier_match(invoice_supplier: str, invoice_vendor_id: str, cont
     
     best_match = None
     best_confidence = 0.0
+    best_name_confidence = 0.0
+    best_vendor_id_match = False
     match_type = "none"
     
-    for supplier in contract_suppliers:
-        supplier_name = supplier.get("name", "")
+    # Calculate name similarity for every candidate up front
+    name_confidences = _score_candidates(invoice_supplier, [s.get("name", "") for s in contract_suppliers])
+    
+    for supplier, name_confidence in zip(contract_suppliers, name_confidences):
         supplier_vendor_id = supplier.get("vendor_id", "")
         
-        # Calculate name similarity
-        name_confidence = calculate_similarity(invoice_supplier, supplier_name)
-        
         # Calculate vendor ID similarity (exact match gets boost)
         vendor_id_confidence = 1.0 if invoice_vendor_id == supplier_vendor_id else 0.0
         
@@ -163,6 +395,12 @@ def find_best_supplier_match(invoice_supplier: str, invoice_vendor_id: str, cont
         if combined_confidence > best_confidence:
             best_confidence = combined_confidence
             best_match = supplier
+            best_name_confidence = name_confidence
+            best_vendor_id_match = vendor_id_confidence == 1.0
+        
+        # Exact vendor ID and name: no later candidate can score higher
+        if vendor_id_confidence == 1.0 and name_confidence == 1.0:
+            break
     
     if best_match and best_confidence >= min_confidence:
         return {
@@ -170,8 +408,8 @@ def find_best_supplier_match(invoice_supplier: str, invoice_vendor_id: str, cont
             "confidence": best_confidence,
             "reasoning": f"Best match found with {best_confidence:.1%} confidence ({match_type})",
             "match_type": match_type,
-            "name_confidence": calculate_similarity(invoice_supplier, best_match.get("name", "")),
-            "vendor_id_match": invoice_vendor_id == best_match.get("vendor_id", "")
+            "name_confidence": best_name_confidence,
+            "vendor_id_match": best_vendor_id_match
         }
     else:
         return {
@@ -182,6 +420,64 @@ def find_best_supplier_match(invoice_supplier: str, invoice_vendor_id: str, cont
         }
 
 
+@functools.lru_cache(maxsize=256)
+def _load_po_file(path: str, mtime_ns: int) -> Tuple[Dict[str, Any], ...]:
+    """
+    Load the PO items of a single PO file, annotated with their source file.
+    Cached by (path, mtime_ns) so repeated resolutions in one process skip the
+    JSON parse, while an edited file is re-read on the next call.
+    The returned items are shared between calls and must be treated as read-only.
+    """
+    data = _read_json_shared(path)
+    if not data:
+        return ()
+    items = []
+    for item in data.get("purchase_orders", []):
+        po_item = dict(item)
+        po_item["_source_file"] = path
+        items.append(po_item)
+    return tuple(items)
+
+
+def iter_po_candidates(po_dirs: List[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield every PO item found in the JSON files of po_dirs, one at a time.
+    Items come from the per-file cache and must be treated as read-only.
+    """
+    for d in po_dirs:
+        try:
+            # List the directory up front so its handle is not held across yields
+            with os.scandir(d) as it:
+                entries = [e for e in it if e.name.endswith(".json") and e.is_file()]
+        except Exception:
+            continue
+        for entry in entries:
+            try:
+                items = _load_po_file(entry.path, entry.stat().st_mtime_ns)
+            except Exception:
+                continue
+            yield from items
+
+
+def _copy_po_items(po_match_result: Dict[str, Any]) -> None:
+    """
+    Replace the cached PO items referenced by a find_best_po_match result with
+    shallow copies (one per item), so callers cannot alter the per-file cache's
+    top-level keys; nested data stays shared and must be treated as read-only.
+    """
+    copies: Dict[int, Dict[str, Any]] = {}
+    
+    def copy_of(item: Dict[str, Any]) -> Dict[str, Any]:
+        if id(item) not in copies:
+            copies[id(item)] = dict(item)
+        return copies[id(item)]
+    
+    if po_match_result.get("match"):
+        po_match_result["match"] = copy_of(po_match_result["match"])
+    for info in po_match_result.get("all_matches", ()):
+        info["po_item"] = copy_of(info["po_item"])
+
+
 def fuzzy_resolve_invoice_to_po_and_contract(
     invoice_filename: str,
     repo_root: Optional[str] = None,
@@ -200,12 +496,6 @@ def fuzzy_resolve_invoice_to_po_and_contract(
     Returns:
         Dict with invoice, po_item, contract, and matching details
     """
-    # Import the existing resolver functions
-    from .po_contract_resolver_tool import (
-        resolve_directories, find_invoice_path, read_json_file,
-        find_contract_by_id, normalize_token
-    )
-    
     root = repo_root or os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
     invoice_dirs, po_dirs, contract_dirs = resolve_directories(
         root,
@@ -236,26 +526,9 @@ def fuzzy_resolve_invoice_to_po_and_contract(
     if not invoice_po:
         return result
     
-    # Collect all PO candidates
-    po_candidates = []
-    for d in po_dirs:
-        try:
-            for name in os.listdir(d):
-                if not name.endswith(".json"):
-                    continue
-                path = os.path.join(d, name)
-                data = read_json_file(path)
-                if not data:
-                    continue
-                for item in data.get("purchase_orders", []):
-                    po_item = dict(item)
-                    po_item["_source_file"] = path
-                    po_candidates.append(po_item)
-        except Exception:
-            continue
-    
     # Find best PO match using fuzzy matching
-    po_match_result = find_best_po_match(invoice_po, po_candidates, min_po_confidence)
+    po_match_result = find_best_po_match(invoice_po, iter_po_candidates(po_dirs), min_po_confidence)
+    _copy_po_items(po_match_result)
     result["matching_details"]["po_match"] = po_match_result
     
     if po_match_result["match"]:
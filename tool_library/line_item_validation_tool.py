@@ -37,11 +37,25 @@ KEY BENEFIT: Prevents subtle billing errors while handling real-world data varia
 
 NOTE: This is the ONLY tool that validates individual line items with flexible scenario handling
 """
+import functools
 import json
-from typing import Any, Dict, List, Optional
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import AbstractSet, Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
 
+from .money_utils import to_cents
 
-def validate_line_items(invoice: Dict[str, Any], po_item: Dict[str, Any]) -> Dict[str, Any]:
+# Batch size above which validate_line_items_batch fans out to worker
+# processes; smaller batches do not cover the pool start-up and pickling cost.
+PARALLEL_BATCH_THRESHOLD = 64
+
+
+def validate_line_items(
+    invoice: Dict[str, Any],
+    po_item: Dict[str, Any],
+    description_scorer: Optional[Callable[[str, str], float]] = None
+) -> Dict[str, Any]:
     """
     Compares invoice line items against purchase order line items.
     
@@ -55,6 +69,9 @@ def validate_line_items(invoice: Dict[str, Any], po_item: Dict[str, Any]) -> Dic
     Args:
         invoice: Invoice data dictionary
         po_item: Purchase order item data dictionary
+        description_scorer: Optional similarity function (0.0 to 1.0) for fuzzy
+            description matching, e.g. levenshtein_description_similarity;
+            defaults to word-overlap (Jaccard) similarity
     
     Returns:
         Dict with validation results including detailed exceptions
@@ -92,19 +109,92 @@ def validate_line_items(invoice: Dict[str, Any], po_item: Dict[str, Any]) -> Dic
     
     # Both have line items - full validation (original logic)
     
-    # Create lookup maps for efficient matching
-    po_items_by_id = {line.get("item_id"): line for line in po_lines if line.get("item_id")}
-    po_items_by_description = {line.get("description", "").lower(): line for line in po_lines if line.get("description")}
-    
-    # Track which PO items have been matched
-    matched_po_items = set()
+    # Index PO lines by position and pre-parse their numeric columns once (SoA),
+    # instead of re-parsing a PO line every time an invoice line matches it
+    po_item_ids = [line.get("item_id") for line in po_lines]
+    po_positions_by_id: Dict[Any, int] = {}
+    po_positions_by_description: Dict[str, int] = {}
+    for pos, (line, po_line_id) in enumerate(zip(po_lines, po_item_ids)):
+        if po_line_id:
+            po_positions_by_id[po_line_id] = pos
+        po_description = line.get("description")
+        if po_description:
+            po_positions_by_description[po_description.lower()] = pos
+    # Tokenize each PO description once rather than once per invoice line
+    po_description_tokens = [(_tokens(desc), pos) for desc, pos in po_positions_by_description.items()]
+    # Inverted index word -> candidate numbers, so an invoice line is only scored
+    # against PO descriptions that share at least one word with it
+    po_description_index: Dict[str, List[int]] = {}
+    for candidate, (words, _) in enumerate(po_description_tokens):
+        for word in words:
+            po_description_index.setdefault(word, []).append(candidate)
+    po_unit_prices = _parse_column(po_lines, "unit_price", float)
+    po_quantities = _parse_column(po_lines, "quantity", int)
+    po_price_cents = [to_cents(price) for price in po_unit_prices]
+    
+    # Same for the invoice side; money is compared in integer cents
+    inv_item_ids = [line.get("item_id") for line in inv_lines]
+    inv_descriptions = [line.get("description", "") for line in inv_lines]
+    inv_unit_prices = _parse_column(inv_lines, "unit_price", float)
+    inv_quantities = _parse_column(inv_lines, "quantity", int)
+    inv_line_totals = _parse_column(inv_lines, "line_total", float)
+    inv_price_cents = [to_cents(price) for price in inv_unit_prices]
+    inv_line_total_cents = [to_cents(total) for total in inv_line_totals]
+    inv_calculated_totals = [
+        price * qty if price is not None and qty is not None else None
+        for price, qty in zip(inv_unit_prices, inv_quantities)
+    ]
+    inv_calculated_cents = [to_cents(total) for total in inv_calculated_totals]
+    
+    # Track which PO items have been matched, one flag per PO line position.
+    # Lines sharing an item_id share the flag at that id's indexed position;
+    # po_flag_slots resolves each line to its flag once, up front.
+    matched_po_lines = bytearray(len(po_lines))
+    po_flag_slots = [po_positions_by_id[iid] if iid else pos for pos, iid in enumerate(po_item_ids)]
+    
+    # Match every invoice line to a PO line position first...
+    match_positions: List[Optional[int]] = []
+    match_methods: List[str] = []
+    for item_id, description in zip(inv_item_ids, inv_descriptions):
+        po_pos = None
+        match_method = "none"
+        
+        if item_id:
+            # First try exact item_id match
+            po_pos = po_positions_by_id.get(item_id)
+            if po_pos is not None:
+                match_method = "item_id_exact"
+                matched_po_lines[po_pos] = 1
+            
+            # If no exact match, try fuzzy description matching
+            if po_pos is None and description:
+                if description_scorer is None:
+                    best_match, best_similarity = _best_description_match(
+                        description, po_description_tokens, token_index=po_description_index
+                    )
+                else:
+                    best_match, best_similarity = _best_scored_description_match(
+                        description, po_positions_by_description, description_scorer
+                    )
+                
+                if best_match is not None:
+                    po_pos = best_match
+                    match_method = f"description_fuzzy_{best_similarity:.1%}"
+                    matched_po_lines[po_flag_slots[po_pos]] = 1
+        
+        match_positions.append(po_pos)
+        match_methods.append(match_method)
+    
+    # ...then run the numeric checks for all matched lines in one pass
+    consistent_lines = _consistent_lines(
+        match_positions,
+        inv_price_cents, inv_quantities, inv_line_total_cents, inv_calculated_cents,
+        po_price_cents, po_quantities
+    )
     
     # Validate each invoice line item
-    for i, inv_line in enumerate(inv_lines):
-        line_exceptions = []
-        item_id = inv_line.get("item_id")
-        description = inv_line.get("description", "")
-        
+    saw_fail = False
+    for i, (item_id, description) in enumerate(zip(inv_item_ids, inv_descriptions)):
         if not item_id:
             exceptions.append({
                 "invoice_line": i + 1,
@@ -113,33 +203,9 @@ def validate_line_items(invoice: Dict[str, Any], po_item: Dict[str, Any]) -> Dic
             })
             continue
         
-        # Try to find matching PO line item
-        po_line = None
-        match_method = "none"
-        
-        # First try exact item_id match
-        if item_id in po_items_by_id:
-            po_line = po_items_by_id[item_id]
-            match_method = "item_id_exact"
-            matched_po_items.add(item_id)
-        
-        # If no exact match, try fuzzy description matching
-        if not po_line and description:
-            best_match = None
-            best_similarity = 0.0
-            
-            for po_desc, po_item_line in po_items_by_description.items():
-                similarity = _calculate_description_similarity(description.lower(), po_desc)
-                if similarity > best_similarity and similarity > 0.8:  # 80% similarity threshold
-                    best_similarity = similarity
-                    best_match = po_item_line
-            
-            if best_match:
-                po_line = best_match
-                match_method = f"description_fuzzy_{best_similarity:.1%}"
-                matched_po_items.add(po_line.get("item_id"))
-        
-        if not po_line:
+        po_pos = match_positions[i]
+        match_method = match_methods[i]
+        if po_pos is None:
             exceptions.append({
                 "invoice_line": i + 1,
                 "item_id": item_id,
@@ -149,77 +215,87 @@ def validate_line_items(invoice: Dict[str, Any], po_item: Dict[str, Any]) -> Dic
             })
             continue
         
+        # Price, quantity and line total all agree - nothing to report. Every
+        # other matched line records at least one discrepancy below, so the
+        # list is only allocated for lines that need it.
+        if consistent_lines[i]:
+            continue
+        line_exceptions = []
+        po_line = po_lines[po_pos]
+        inv_qty = inv_quantities[i]
+        po_qty = po_quantities[po_pos]
+        
         # Validate unit price
-        try:
-            inv_price = float(inv_line.get("unit_price", 0.0))
-            po_price = float(po_line.get("unit_price", 0.0))
-            
-            if round(inv_price, 2) != round(po_price, 2):
-                line_exceptions.append({
-                    "field": "unit_price",
-                    "status": "FAIL",
-                    "invoice_value": inv_price,
-                    "po_value": po_price,
-                    "difference": round(inv_price - po_price, 2),
-                    "percentage_diff": round(((inv_price - po_price) / po_price * 100), 2) if po_price > 0 else 0
-                })
-        except (ValueError, TypeError):
+        inv_price = inv_unit_prices[i]
+        po_price = po_unit_prices[po_pos]
+        if inv_price_cents[i] is None or po_price_cents[po_pos] is None:
             line_exceptions.append({
                 "field": "unit_price",
                 "status": "FAIL",
                 "error": "could_not_parse_prices"
             })
+            saw_fail = True
+        elif inv_price_cents[i] != po_price_cents[po_pos]:
+            line_exceptions.append({
+                "field": "unit_price",
+                "status": "FAIL",
+                "invoice_value": inv_price,
+                "po_value": po_price,
+                "difference": round(inv_price - po_price, 2),
+                "percentage_diff": round(((inv_price - po_price) / po_price * 100), 2) if po_price > 0 else 0
+            })
+            saw_fail = True
         
         # Validate quantity
-        try:
-            inv_qty = int(inv_line.get("quantity", 0))
-            po_qty = int(po_line.get("quantity", 0))
-            
-            if inv_qty > po_qty:
-                line_exceptions.append({
-                    "field": "quantity",
-                    "status": "FAIL",
-                    "invoice_value": inv_qty,
-                    "po_value": po_qty,
-                    "excess": inv_qty - po_qty,
-                    "percentage_excess": round(((inv_qty - po_qty) / po_qty * 100), 2) if po_qty > 0 else 0
-                })
-            elif inv_qty < po_qty:
-                # Quantity under PO is usually OK, but log for awareness
-                line_exceptions.append({
-                    "field": "quantity",
-                    "status": "INFO",
-                    "invoice_value": inv_qty,
-                    "po_value": po_qty,
-                    "shortage": po_qty - inv_qty,
-                    "message": "Invoice quantity is less than PO quantity"
-                })
-        except (ValueError, TypeError):
+        if inv_qty is None or po_qty is None:
             line_exceptions.append({
                 "field": "quantity",
                 "status": "FAIL",
                 "error": "could_not_parse_quantities"
             })
+            saw_fail = True
+        elif inv_qty > po_qty:
+            line_exceptions.append({
+                "field": "quantity",
+                "status": "FAIL",
+                "invoice_value": inv_qty,
+                "po_value": po_qty,
+                "excess": inv_qty - po_qty,
+                "percentage_excess": round(((inv_qty - po_qty) / po_qty * 100), 2) if po_qty > 0 else 0
+            })
+            saw_fail = True
+        elif inv_qty < po_qty:
+            # Quantity under PO is usually OK, but log for awareness
+            line_exceptions.append({
+                "field": "quantity",
+                "status": "INFO",
+                "invoice_value": inv_qty,
+                "po_value": po_qty,
+                "shortage": po_qty - inv_qty,
+                "message": "Invoice quantity is less than PO quantity"
+            })
         
         # Validate line total calculation
-        try:
-            inv_line_total = float(inv_line.get("line_total", 0.0))
-            calculated_total = inv_price * inv_qty
-            
-            if round(inv_line_total, 2) != round(calculated_total, 2):
-                line_exceptions.append({
-                    "field": "line_total",
-                    "status": "FAIL",
-                    "invoice_value": inv_line_total,
-                    "calculated_value": calculated_total,
-                    "difference": round(inv_line_total - calculated_total, 2)
-                })
-        except (ValueError, TypeError):
+        inv_line_total = inv_line_totals[i]
+        calculated_total = inv_calculated_totals[i]
+        line_total_cents = inv_line_total_cents[i]
+        calculated_cents = inv_calculated_cents[i]
+        if line_total_cents is None or calculated_cents is None:
             line_exceptions.append({
                 "field": "line_total",
                 "status": "FAIL",
                 "error": "could_not_parse_line_total"
             })
+            saw_fail = True
+        elif line_total_cents != calculated_cents:
+            line_exceptions.append({
+                "field": "line_total",
+                "status": "FAIL",
+                "invoice_value": inv_line_total,
+                "calculated_value": calculated_total,
+                "difference": round(inv_line_total - calculated_total, 2)
+            })
+            saw_fail = True
         
         # Add line item to exceptions if there are any failures
         if line_exceptions:
@@ -228,16 +304,15 @@ def validate_line_items(invoice: Dict[str, Any], po_item: Dict[str, Any]) -> Dic
                 "item_id": item_id,
                 "description": description,
                 "match_method": match_method,
-                "po_item_id": po_line.get("item_id"),
+                "po_item_id": po_item_ids[po_pos],
                 "po_description": po_line.get("description"),
                 "discrepancies": line_exceptions
             })
     
     # Check for PO items that weren't invoiced (potential underbilling)
     uninvoiced_items = []
-    for po_line in po_lines:
-        po_item_id = po_line.get("item_id")
-        if po_item_id and po_item_id not in matched_po_items:
+    for po_line, po_item_id, slot in zip(po_lines, po_item_ids, po_flag_slots):
+        if po_item_id and not matched_po_lines[slot]:
             uninvoiced_items.append({
                 "po_item_id": po_item_id,
                 "description": po_line.get("description"),
@@ -255,27 +330,98 @@ def validate_line_items(invoice: Dict[str, Any], po_item: Dict[str, Any]) -> Dic
             "items": uninvoiced_items
         })
     
-    # Determine overall status
-    has_failures = any(
-        exc.get("discrepancies") and 
-        any(d.get("status") == "FAIL" for d in exc.get("discrepancies", []))
-        for exc in exceptions
-    )
-    
+    # Determine overall status (any FAIL discrepancy was flagged as it was added)
     return {
         "tool": tool_name,
-        "status": "PASS" if not has_failures else "FAIL",
+        "status": "PASS" if not saw_fail else "FAIL",
         "exceptions": exceptions,
         "summary": {
             "total_invoice_lines": len(inv_lines),
             "total_po_lines": len(po_lines),
-            "matched_lines": len(matched_po_items),
+            "matched_lines": matched_po_lines.count(1),
             "failed_validations": len([e for e in exceptions if e.get("discrepancies")]),
             "uninvoiced_items": len(uninvoiced_items)
         }
     }
 
 
+def _parse_column(lines: List[Dict[str, Any]], field: str, cast: Callable[[Any], Any]) -> List[Optional[Any]]:
+    """
+    Parse one numeric field of every line into a list aligned with `lines`.
+    Missing values default to 0; values that cannot be parsed become None.
+    """
+    # Well-formed data parses in one pass; only a bad value pays for per-line handling
+    try:
+        return [cast(line.get(field, 0)) for line in lines]
+    except (ValueError, TypeError):
+        pass
+    column: List[Optional[Any]] = []
+    for line in lines:
+        try:
+            column.append(cast(line.get(field, 0)))
+        except (ValueError, TypeError):
+            column.append(None)
+    return column
+
+
+def validate_line_items_batch(
+    invoices: Sequence[Dict[str, Any]],
+    po_items: Sequence[Dict[str, Any]],
+    max_workers: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Run validate_line_items over pairs of invoices and PO items, returning the
+    results in input order. Each validation is independent and pure, so large
+    batches are spread over a process pool; small ones run serially.
+    
+    Args:
+        invoices: Invoice data dictionaries
+        po_items: Purchase order item dictionaries, one per invoice
+        max_workers: Worker process count (defaults to the CPU count)
+    
+    Returns:
+        List of validate_line_items results
+    """
+    if len(invoices) != len(po_items):
+        raise ValueError("invoices and po_items must have the same length")
+    
+    if len(invoices) <= PARALLEL_BATCH_THRESHOLD:
+        return [validate_line_items(invoice, po_item) for invoice, po_item in zip(invoices, po_items)]
+    
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            return list(pool.map(validate_line_items, invoices, po_items, chunksize=16))
+    except (OSError, BrokenProcessPool):
+        # Pool unavailable (e.g. sandboxed runtime) or a worker died - fall back to serial
+        # validation; errors raised by validate_line_items itself propagate as they would serially
+        return [validate_line_items(invoice, po_item) for invoice, po_item in zip(invoices, po_items)]
+
+
+def _consistent_lines(
+    match_positions: List[Optional[int]],
+    inv_price_cents: List[Optional[int]],
+    inv_quantities: List[Optional[int]],
+    inv_line_total_cents: List[Optional[int]],
+    inv_calculated_cents: List[Optional[int]],
+    po_price_cents: List[Optional[int]],
+    po_quantities: List[Optional[int]]
+) -> bytearray:
+    """
+    Numeric core of validate_line_items, working only on the parsed columns:
+    flags (1) every matched invoice line whose unit price, quantity and line total
+    all agree with its PO line, so discrepancy details are only built for the rest.
+    """
+    return bytearray(
+        pos is not None
+        and price is not None and price == po_price_cents[pos]
+        and qty is not None and qty == po_quantities[pos]
+        and total is not None and total == calculated
+        for pos, price, qty, total, calculated in zip(
+            match_positions, inv_price_cents, inv_quantities, inv_line_total_cents, inv_calculated_cents
+        )
+    )
+
+
 def _validate_invoice_total_against_po_lines(invoice: Dict[str, Any], po_item: Dict[str, Any], po_lines: List[Dict[str, Any]], tool_name: str) -> Dict[str, Any]:
     """
     Scenario 2: Only PO has line items - validate invoice total against PO line items.
@@ -364,15 +510,11 @@ def _validate_invoice_lines_against_po_description(invoice: Dict[str, Any], po_i
         })
     
     # Validate line item descriptions against PO description (fuzzy matching)
-    po_desc_words = set(po_description.lower().split())
     for i, line in enumerate(inv_lines):
         line_desc = line.get("description", "")
-        line_desc_words = set(line_desc.lower().split())
         
         # Calculate word overlap
-        overlap = len(po_desc_words.intersection(line_desc_words))
-        total_words = len(po_desc_words.union(line_desc_words))
-        similarity = overlap / total_words if total_words > 0 else 0
+        similarity = _calculate_description_similarity(line_desc, po_description)
         
         if similarity < 0.3:  # Low similarity threshold
             exceptions.append({
@@ -398,24 +540,172 @@ def _validate_invoice_lines_against_po_description(invoice: Dict[str, Any], po_i
     }
 
 
+def _best_description_match(
+    description: str,
+    candidates: List[Tuple[FrozenSet[str], int]],
+    score_cutoff: float = 0.8,
+    token_index: Optional[Dict[str, List[int]]] = None
+) -> Tuple[Optional[int], float]:
+    """
+    Find the candidate description most similar to `description`, in the spirit
+    of rapidfuzz's process.extractOne: candidates are (word set, PO line position)
+    pairs of lowercased descriptions, and only a similarity above score_cutoff
+    counts as a match. Ties go to the first candidate, so the scan stops at the
+    first exact match.
+    
+    token_index optionally maps each word to the numbers of the candidates that
+    contain it; only candidates sharing a word with the query (the only ones
+    with a non-zero score) are then visited.
+    
+    Returns:
+        (position, similarity) of the best match, or (None, 0.0) if none qualifies
+    """
+    query_words = _tokens(description)
+    if not query_words:
+        return None, 0.0
+    if token_index is not None:
+        # Visit in candidate order so ties resolve exactly as in a full scan
+        shared = sorted({c for word in query_words for c in token_index.get(word, ())})
+        candidates = [candidates[c] for c in shared]
+    query_size = len(query_words)
+    best_pos = None
+    best_similarity = score_cutoff
+    for candidate_words, pos in candidates:
+        # Jaccard can never exceed smaller/larger word count, so candidates whose
+        # size alone rules out beating the current best are not scored
+        candidate_size = len(candidate_words)
+        if candidate_size < query_size:
+            if candidate_size / query_size <= best_similarity:
+                continue
+        elif query_size / candidate_size <= best_similarity:
+            continue
+        similarity = _jaccard_similarity(query_words, candidate_words)
+        if similarity > best_similarity:
+            best_pos = pos
+            best_similarity = similarity
+            if similarity >= 1.0:
+                break
+    if best_pos is None:
+        return None, 0.0
+    return best_pos, best_similarity
+
+
+def _best_scored_description_match(
+    description: str,
+    candidates: Dict[str, int],
+    scorer: Callable[[str, str], float],
+    score_cutoff: float = 0.8
+) -> Tuple[Optional[int], float]:
+    """
+    Same as _best_description_match, but scores the lowercased descriptions
+    (candidates maps them to PO line positions) with a caller-supplied scorer.
+    """
+    query = description.lower()
+    best_pos = None
+    best_similarity = score_cutoff
+    for candidate, pos in candidates.items():
+        similarity = scorer(query, candidate)
+        if similarity > best_similarity:
+            best_pos = pos
+            best_similarity = similarity
+            if similarity >= 1.0:
+                break
+    if best_pos is None:
+        return None, 0.0
+    return best_pos, best_similarity
+
+
+def levenshtein_description_similarity(desc1: str, desc2: str) -> float:
+    """
+    Character-level alternative to the word-overlap description similarity:
+    1 - Levenshtein distance / longer length, after lowercasing and collapsing
+    whitespace. Unlike word overlap it tolerates typos and punctuation changes
+    inside words. Pass as description_scorer to validate_line_items.
+    """
+    if not desc1 or not desc2:
+        return 0.0
+    
+    norm1 = " ".join(desc1.lower().split())
+    norm2 = " ".join(desc2.lower().split())
+    if not norm1 or not norm2:
+        return 0.0
+    
+    return 1.0 - _levenshtein_distance(norm1, norm2) / max(len(norm1), len(norm2))
+
+
+def _levenshtein_distance(a: str, b: str) -> int:
+    """
+    Levenshtein distance using Myers' bit-parallel algorithm (Hyyro's variant):
+    each column of the DP matrix is kept as bit vectors, so a text character
+    costs a handful of integer operations instead of a pass over the pattern.
+    """
+    # The shorter string is the pattern, keeping the bit vectors small
+    if len(a) > len(b):
+        a, b = b, a
+    m = len(a)
+    if m == 0:
+        return len(b)
+    
+    # Bit i of peq[c] is set where a[i] == c
+    peq: Dict[str, int] = {}
+    for i, char in enumerate(a):
+        peq[char] = peq.get(char, 0) | (1 << i)
+    
+    mask = (1 << m) - 1
+    high_bit = 1 << (m - 1)
+    pv = mask   # vertical +1 deltas
+    mv = 0      # vertical -1 deltas
+    score = m
+    for char in b:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = ((((eq & pv) + pv) & mask) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & mask
+        mh = pv & xh
+        if ph & high_bit:
+            score += 1
+        elif mh & high_bit:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv
+    return score
+
+
 def _calculate_description_similarity(desc1: str, desc2: str) -> float:
     """
     Calculate similarity between two descriptions using simple word overlap.
     More sophisticated than basic string similarity for product descriptions.
     """
+    # The score is symmetric, so (a, b) and (b, a) share one cache entry
+    if desc2 < desc1:
+        desc1, desc2 = desc2, desc1
+    return _cached_description_similarity(desc1, desc2)
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_description_similarity(desc1: str, desc2: str) -> float:
     if not desc1 or not desc2:
         return 0.0
     
-    # Split into words and normalize
-    words1 = set(desc1.lower().split())
-    words2 = set(desc2.lower().split())
-    
+    return _jaccard_similarity(_tokens(desc1), _tokens(desc2))
+
+
+@functools.lru_cache(maxsize=2048)
+def _tokens(text: str) -> FrozenSet[str]:
+    """Lowercased word set of a description, cached since descriptions repeat across lines and invoices."""
+    return frozenset(text.lower().split())
+
+
+def _jaccard_similarity(words1: AbstractSet[str], words2: AbstractSet[str]) -> float:
+    """Jaccard similarity of two word sets; 0.0 if either is empty."""
     if not words1 or not words2:
         return 0.0
     
-    # Calculate Jaccard similarity
-    intersection = len(words1.intersection(words2))
-    union = len(words1.union(words2))
+    # |A | B| = |A| + |B| - |A & B|, so the union set never has to be built
+    intersection = len(words1 & words2)
+    union = len(words1) + len(words2) - intersection
     
     return intersection / union if union > 0 else 0.0
 
@@ -0,0 +1,11 @@
+from typing import Optional
+
+
+def to_cents(amount: Optional[float]) -> Optional[int]:
+    """Convert a money amount to integer cents; None if it is missing, NaN or infinite."""
+    if amount is None:
+        return None
+    try:
+        return round(amount * 100)
+    except (ValueError, OverflowError):
+        return None
@@ -27,6 +27,17 @@ import json
 import re
 from typing import Any, Dict, List
 
+# Supported payment terms (can be expanded)
+SUPPORTED_TERMS = frozenset({"Net 15", "Net 30", "Net 45", "Net 60"})
+
+# Exception payload forms of SUPPORTED_TERMS, built once and in a stable order
+# (each exception gets its own list of the sorted terms)
+_SUPPORTED_TERMS_SORTED = tuple(sorted(SUPPORTED_TERMS))
+_SUPPORTED_TERMS_TEXT = ", ".join(_SUPPORTED_TERMS_SORTED)
+
+# Payment terms format: "Net X" where X is a number of days
+_NET_TERMS_RE = re.compile(r'^Net\s+(\d+)$', re.IGNORECASE)
+
 
 def validate_payment_terms(invoice: Dict[str, Any], contract: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -45,9 +56,6 @@ def validate_payment_terms(invoice: Dict[str, Any], contract: Dict[str, Any]) ->
     tool_name = "payment_terms_validation_tool"
     exceptions: List[Dict[str, Any] | str] = []
     
-    # Supported payment terms (can be expanded)
-    SUPPORTED_TERMS = {"Net 15", "Net 30", "Net 45", "Net 60"}
-    
     # Extract payment terms information
     invoice_terms = (invoice or {}).get("payment_terms", "").strip() if invoice else ""
     contract_terms = "Net 30"  # Default
@@ -67,10 +75,10 @@ def validate_payment_terms(invoice: Dict[str, Any], contract: Dict[str, Any]) ->
             "exceptions": exceptions,
         }
     
-    # Validate payment terms format (should be "Net X" where X is a number)
-    net_pattern = r'^Net\s+(\d+)$'
-    match = re.match(net_pattern, invoice_terms, re.IGNORECASE)
-    if not match:
+    # Validate payment terms format (should be "Net X" where X is a number);
+    # supported terms are well-formed by definition, so skip the regex for them
+    is_supported = invoice_terms in SUPPORTED_TERMS
+    if not is_supported and not _NET_TERMS_RE.match(invoice_terms):
         exceptions.append({
             "type": "invalid_payment_terms_format",
             "invoice_terms": invoice_terms,
@@ -78,18 +86,15 @@ def validate_payment_terms(invoice: Dict[str, Any], contract: Dict[str, Any]) ->
             "comparison_method": "format_validation",
             "threshold": "Payment terms must match pattern 'Net X'"
         })
-    else:
-        # Extract the number of days if valid format
-        days = match.group(1)
     
     # Check if payment terms are supported
-    if invoice_terms not in SUPPORTED_TERMS:
+    if not is_supported:
         exceptions.append({
             "type": "unsupported_payment_terms",
             "invoice_terms": invoice_terms,
-            "supported_terms": list(SUPPORTED_TERMS),
+            "supported_terms": list(_SUPPORTED_TERMS_SORTED),
             "comparison_method": "supported_terms_check",
-            "threshold": f"Payment terms must be one of: {', '.join(SUPPORTED_TERMS)}"
+            "threshold": f"Payment terms must be one of: {_SUPPORTED_TERMS_TEXT}"
         })
     
     # Check payment terms consistency with contract (if contract specifies terms)
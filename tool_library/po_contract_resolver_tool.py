@@ -1,8 +1,35 @@
+import codecs
+import copy
+import functools
+import hashlib
 import json
 import os
 import re
 import sys
-from typing import Any, Dict, List, Optional, Tuple, Union
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    # Optional speed-up only; the stdlib parser gives the same result
+    orjson = None
+
+# Everything normalize_token strips (applied after uppercasing)
+_NON_ALNUM_RE = re.compile(r"[^A-Z0-9]")
+
+# Normalized tokens shorter than this are interned (real IDs are well below it)
+_INTERN_MAX_LENGTH = 64
+
+# Directory to persist built lookup indexes in, so a new process can skip re-parsing
+# every PO/contract file when none changed (checked against the stat signature).
+# Opt-in: None (the default) keeps indexes in memory only and lookups never write.
+INDEX_CACHE_DIR: Optional[str] = None
+
+# File count above which index builds read files on a thread pool, overlapping
+# disk reads with parsing; below it the pool costs more than it saves.
+PARALLEL_READ_THRESHOLD = 4
 
 
 def normalize_token(value: Optional[str]) -> Optional[str]:
@@ -12,17 +39,64 @@ def normalize_token(value: Optional[str]) -> Optional[str]:
     """
     if not value:
         return value
-    return re.sub(r"[^A-Z0-9]", "", value.upper())
+    # Already canonical (e.g. "PO2025303A"): nothing to uppercase or strip
+    if not (value.isascii() and value.isalnum() and value.isupper()):
+        value = _NON_ALNUM_RE.sub("", value.upper())
+    # Identifiers recur across a batch; interned, index lookups match on identity
+    if len(value) < _INTERN_MAX_LENGTH:
+        value = sys.intern(value)
+    return value
 
 
 def read_json_file(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Load a JSON file, or None if it is missing or unreadable. The file is parsed
+    once per (path, mtime_ns, size); each call returns its own copy, so callers
+    may modify the result.
+    """
+    return copy.deepcopy(_read_json_shared(path))
+
+
+def _read_json_shared(path: str) -> Optional[Dict[str, Any]]:
+    # Cached parse shared between calls - only for loaders that never hand it out unchanged
+    try:
+        st = os.stat(path)
+    except Exception:
+        return None
+    return _read_json_cached(path, st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=512)
+def _read_json_cached(path: str, mtime_ns: int, size: int) -> Optional[Dict[str, Any]]:
     try:
-        with open(path, "r", encoding="utf-8-sig") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            raw = f.read()
+        if raw.startswith(codecs.BOM_UTF8):
+            raw = raw[len(codecs.BOM_UTF8):]
+        if orjson is not None:
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                # orjson is stricter (e.g. NaN, huge integers) - let json decide
+                pass
+        return json.loads(raw.decode("utf-8"))
     except Exception:
         return None
 
 
+@functools.lru_cache(maxsize=256)
+def _load_contract_file(path: str, mtime_ns: int) -> Optional[Dict[str, Any]]:
+    """
+    Load a contract file annotated with its source file, cached by (path, mtime_ns).
+    The returned dict is shared between calls and must be treated as read-only.
+    """
+    data = _read_json_shared(path)
+    if data:
+        data = dict(data)
+        data["_source_file"] = path
+    return data
+
+
 def find_base_json_dirs(repo_root: str) -> List[str]:
     candidates = []
     for name in ["json_files", "json files"]:
@@ -35,20 +109,23 @@ def find_base_json_dirs(repo_root: str) -> List[str]:
 def find_subdir_case_insensitive(parent: str, target_name: str) -> Optional[str]:
     if not os.path.isdir(parent):
         return None
-    names = os.listdir(parent)
-    for n in names:
-        if n.lower() == target_name.lower():
-            candidate = os.path.join(parent, n)
-            if os.path.isdir(candidate):
-                return candidate
+    target = target_name.lower()
+    with os.scandir(parent) as it:
+        for entry in it:
+            if entry.name.lower() == target and entry.is_dir():
+                return entry.path
     return None
 
 
+@functools.lru_cache(maxsize=32)
 def resolve_directories(repo_root: str, fixed_po_dir: str = None, fixed_contract_dir: str = None) -> Tuple[List[str], List[str], List[str]]:
     """
     Returns lists of candidate directories for invoices, POs, and contracts.
     Supports both json_files/* and json files/* layouts with varied casing.
     If fixed paths are provided, use those instead of searching relative to repo_root.
+    The layout is resolved once per argument set (the lists are shared and must be
+    treated as read-only); call resolve_directories.cache_clear() after creating
+    or renaming data directories.
     """
     base_dirs = find_base_json_dirs(repo_root)
     invoice_dirs: List[str] = []
@@ -104,56 +181,147 @@ def find_invoice_path(invoice_filename: str, invoice_dirs: List[str]) -> Optiona
 
 
 def list_invoices(invoice_dirs: List[str]) -> List[str]:
-    files: List[str] = []
-    for d in invoice_dirs:
+    # Collect every directory's entries, then sort once: by directory order, then name
+    entries: List[Tuple[int, str, str]] = []
+    for dir_index, d in enumerate(invoice_dirs):
         try:
-            for name in sorted(os.listdir(d)):
-                if name.endswith(".json"):
-                    files.append(os.path.join(d, name))
+            with os.scandir(d) as it:
+                entries.extend((dir_index, e.name, e.path) for e in it if e.name.endswith(".json") and e.is_file())
         except Exception:
             continue
-    return files
+    entries.sort()
+    return [path for _, _, path in entries]
 
 
-def find_po_item_by_po_number(normalized_po: str, po_dirs: List[str]) -> Optional[Dict[str, Any]]:
-    for d in po_dirs:
+def _json_files_signature(dirs: List[str]) -> Tuple[Tuple[str, int, int], ...]:
+    """
+    (path, mtime_ns, size) of every JSON file in dirs, in scan order. Used as the
+    cache key of the lookup indexes, so any added, removed or edited file
+    triggers a rebuild.
+    """
+    signature = []
+    for d in dirs:
         try:
-            for name in os.listdir(d):
-                if not name.endswith(".json"):
-                    continue
-                path = os.path.join(d, name)
-                data = read_json_file(path)
-                if not data:
-                    continue
-                for item in data.get("purchase_orders", []):
-                    po_num = normalize_token(item.get("po_number"))
-                    if po_num and po_num == normalized_po:
-                        # Return only the matching PO item, and annotate source file for context
-                        match = dict(item)
-                        match["_source_file"] = path
-                        return match
+            with os.scandir(d) as it:
+                for entry in it:
+                    if entry.name.endswith(".json") and entry.is_file():
+                        st = entry.stat()
+                        signature.append((entry.path, st.st_mtime_ns, st.st_size))
         except Exception:
             continue
-    return None
+    return tuple(signature)
 
 
-def find_contract_by_id(normalized_contract_id: str, contract_dirs: List[str]) -> Optional[Dict[str, Any]]:
-    for d in contract_dirs:
+def _map_files(load: Callable[..., Any], *args: List[Any]) -> List[Any]:
+    """load(*per-file args) for every file, in order; threaded for larger directories."""
+    if len(args[0]) <= PARALLEL_READ_THRESHOLD:
+        return list(map(load, *args))
+    with ThreadPoolExecutor(max_workers=min(8, len(args[0]))) as pool:
+        return list(pool.map(load, *args))
+
+
+def _index_cache_path(kind: str, signature: Tuple[Tuple[str, int, int], ...]) -> Optional[str]:
+    # One file per set of indexed directories, so separate repo roots do not overwrite each other
+    if INDEX_CACHE_DIR is None or not signature:
+        return None
+    dirs = "\n".join(sorted({os.path.dirname(path) for path, _, _ in signature}))
+    digest = hashlib.sha1(dirs.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(INDEX_CACHE_DIR, f".resolver_{kind}_index_{digest}.json")
+
+
+def _load_persisted_index(kind: str, signature: Tuple[Tuple[str, int, int], ...]) -> Optional[Dict[str, Any]]:
+    """The index persisted by an earlier process, if it was built from exactly these files."""
+    path = _index_cache_path(kind, signature)
+    if path is None:
+        return None
+    cached = _read_json_shared(path)
+    if not isinstance(cached, dict) or cached.get("signature") != [list(entry) for entry in signature]:
+        return None
+    index = cached.get("index")
+    return index if isinstance(index, dict) else None
+
+
+def _persist_index(kind: str, signature: Tuple[Tuple[str, int, int], ...], index: Dict[str, Any]) -> None:
+    """Best-effort atomic write of a built index (when INDEX_CACHE_DIR is set); failures only cost a rebuild next run."""
+    path = _index_cache_path(kind, signature)
+    if path is None:
+        return
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(INDEX_CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"signature": signature, "index": index}, f)
+        os.replace(tmp_path, path)
+    except Exception:
         try:
-            for name in os.listdir(d):
-                if not name.endswith(".json"):
-                    continue
-                path = os.path.join(d, name)
-                data = read_json_file(path)
-                if not data:
-                    continue
-                cid = normalize_token(data.get("contract_id"))
-                if cid and cid == normalized_contract_id:
-                    data["_source_file"] = path
-                    return data
+            os.remove(tmp_path)
         except Exception:
+            pass
+
+
+@functools.lru_cache(maxsize=8)
+def _po_index(signature: Tuple[Tuple[str, int, int], ...]) -> Dict[str, Dict[str, Any]]:
+    """
+    Map normalized PO numbers to their PO item annotated with its source file.
+    The first occurrence wins, as in a linear scan. Items are annotated once
+    per directory state and shared between lookups, so must be treated as read-only.
+    """
+    persisted = _load_persisted_index("po", signature)
+    if persisted is not None:
+        return persisted
+    index: Dict[str, Dict[str, Any]] = {}
+    paths = [path for path, _, _ in signature]
+    for path, data in zip(paths, _map_files(_read_json_shared, paths)):
+        if not data:
             continue
-    return None
+        try:
+            for item in data.get("purchase_orders", []):
+                po_num = normalize_token(item.get("po_number"))
+                if po_num and po_num not in index:
+                    po_item = dict(item)
+                    po_item["_source_file"] = path
+                    index[po_num] = po_item
+        except Exception:
+            continue
+    _persist_index("po", signature, index)
+    return index
+
+
+@functools.lru_cache(maxsize=8)
+def _contract_index(signature: Tuple[Tuple[str, int, int], ...]) -> Dict[str, Dict[str, Any]]:
+    """Map normalized contract IDs to their (shared, read-only) contract data; first occurrence wins."""
+    persisted = _load_persisted_index("contract", signature)
+    if persisted is not None:
+        return persisted
+    index: Dict[str, Dict[str, Any]] = {}
+    paths = [path for path, _, _ in signature]
+    mtimes = [mtime_ns for _, mtime_ns, _ in signature]
+    for data in _map_files(_load_contract_file, paths, mtimes):
+        if not data:
+            continue
+        try:
+            cid = normalize_token(data.get("contract_id"))
+        except Exception:
+            continue
+        if cid and cid not in index:
+            index[cid] = data
+    _persist_index("contract", signature, index)
+    return index
+
+
+def find_po_item_by_po_number(normalized_po: str, po_dirs: List[str]) -> Optional[Dict[str, Any]]:
+    # Parse the PO files once per directory state, then answer lookups from the index.
+    # Returns only the matching PO item (annotated with its source file for context),
+    # as a shallow copy: its top-level keys are the caller's, nested data (e.g. line_items)
+    # is shared with the index and must be treated as read-only.
+    item = _po_index(_json_files_signature(po_dirs)).get(normalized_po)
+    return dict(item) if item is not None else None
+
+
+def find_contract_by_id(normalized_contract_id: str, contract_dirs: List[str]) -> Optional[Dict[str, Any]]:
+    # Shallow copy of the indexed contract; nested data (e.g. parties) is shared and read-only
+    data = _contract_index(_json_files_signature(contract_dirs)).get(normalized_contract_id)
+    return dict(data) if data is not None else None
 
 
 def resolve_invoice_to_po_and_contract(
@@ -1,6 +1,8 @@
 import json
 from typing import Any, Dict, List
 
+from .money_utils import to_cents
+
 
 def validate_billing(invoice: Dict[str, Any], po_item: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -15,11 +17,11 @@ def validate_billing(invoice: Dict[str, Any], po_item: Dict[str, Any]) -> Dict[s
     inv_sub = float(inv_sum.get("subtotal", 0.0))
     inv_tax = float(inv_sum.get("tax_amount", 0.0))
     
-    # Check arithmetic: subtotal + tax == total
-    calculated_total = round(inv_sub + inv_tax, 2)
-    inv_total_rounded = round(inv_total, 2)
+    # Check arithmetic: subtotal + tax == total, compared in integer cents
+    calculated_cents = to_cents(inv_sub + inv_tax)
     
-    if calculated_total != inv_total_rounded:
+    if calculated_cents is None or calculated_cents != to_cents(inv_total):
+        calculated_total = round(inv_sub + inv_tax, 2)
         exceptions.append({
             "type": "billing_amount_mismatch",
             "invoice_subtotal": inv_sub,
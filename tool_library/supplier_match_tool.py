@@ -2,6 +2,9 @@ import json
 import re
 from typing import Any, Dict, List, Tuple
 
+# Shorter strings are compared character by character; longer ones by bisection
+DIFF_BISECT_MIN_LENGTH = 32
+
 
 def _highlight_diff(str1: str, str2: str) -> str:
     """
@@ -11,27 +14,29 @@ def _highlight_diff(str1: str, str2: str) -> str:
     if str1 == str2:
         return "Strings are identical"
     
-    # Show character-by-character comparison
-    diff_parts = []
-    max_len = max(len(str1), len(str2))
-    
-    for i in range(max_len):
-        char1 = str1[i] if i < len(str1) else ''
-        char2 = str2[i] if i < len(str2) else ''
-        
-        if char1 != char2:
-            # Find where the difference starts
-            if char1 == ' ':
-                diff_parts.append(f"Position {i}: '[SPACE]' vs '{char2}'")
-            elif char2 == ' ':
-                diff_parts.append(f"Position {i}: '{char1}' vs '[SPACE]'")
-            else:
-                diff_parts.append(f"Position {i}: '{char1}' vs '{char2}'")
-    
-    if diff_parts:
-        return f"First difference at position {diff_parts[0].split(':')[0].split()[-1]}"
-    
-    return f"Length difference: {len(str1)} vs {len(str2)} chars"
+    return f"First difference at position {_common_prefix_length(str1, str2)}"
+
+
+def _common_prefix_length(str1: str, str2: str) -> int:
+    """Length of the common prefix, i.e. the position of the first difference."""
+    shorter = min(len(str1), len(str2))
+    if shorter <= DIFF_BISECT_MIN_LENGTH:
+        # Only the first difference is reported, so stop at the first mismatch
+        for i, (char1, char2) in enumerate(zip(str1, str2)):
+            if char1 != char2:
+                return i
+        return shorter
+
+    # Long strings: bisect on slice equality, which compares whole blocks in C
+    # rather than one character per interpreter iteration
+    lo, hi = 0, shorter
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if str1[:mid] == str2[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
 
 
 def _get_string_details(value: Any) -> str:
@@ -49,11 +54,13 @@ def _get_string_details(value: Any) -> str:
     return details
 
 
-def validate_supplier(invoice: Dict[str, Any], contract: Dict[str, Any]) -> Dict[str, Any]:
+def validate_supplier(invoice: Dict[str, Any], contract: Dict[str, Any], details: bool = True) -> Dict[str, Any]:
     """
     Validate supplier and bill-to consistency between invoice and contract.
 
-    Returns a dict: { tool, status, exceptions } where exceptions contain detailed mismatch information
+    Returns a dict: { tool, status, exceptions } where exceptions contain detailed mismatch information.
+    With details=False the value descriptions and diff position are skipped, for
+    callers that only need the mismatch types and values.
     """
     exceptions: List[str | Dict[str, Any]] = []
     tool_name = "supplier_match_tool"
@@ -69,63 +76,28 @@ def validate_supplier(invoice: Dict[str, Any], contract: Dict[str, Any]) -> Dict
     if not contract:
         exceptions.append("contract: <not found>")
 
-    # Check supplier name mismatch with detailed information
-    inv_name = inv_supplier.get("name", "")
-    con_name = con_supplier.get("name", "")
-    if inv_name != con_name:
-        # Create detailed exception with actual values and differences
-        diff_analysis = _highlight_diff(inv_name, con_name)
-        inv_details = _get_string_details(inv_name)
-        con_details = _get_string_details(con_name)
-        
-        exceptions.append({
-            "type": "supplier_name_mismatch",
-            "invoice_value": inv_name,
-            "expected_value": con_name,
-            "invoice_value_details": inv_details,
-            "expected_value_details": con_details,
-            "difference": diff_analysis,
-            "comparison_method": "exact_match",
-            "threshold": "100% exact match required"
-        })
-    
-    # Check vendor ID mismatch with detailed information
-    inv_vendor_id = inv_supplier.get("vendor_id", "")
-    con_vendor_id = con_supplier.get("vendor_id", "")
-    if inv_vendor_id != con_vendor_id:
-        diff_analysis = _highlight_diff(inv_vendor_id, con_vendor_id)
-        inv_vid_details = _get_string_details(inv_vendor_id)
-        con_vid_details = _get_string_details(con_vendor_id)
-        
-        exceptions.append({
-            "type": "supplier_vendor_id_mismatch",
-            "invoice_value": inv_vendor_id,
-            "expected_value": con_vendor_id,
-            "invoice_value_details": inv_vid_details,
-            "expected_value_details": con_vid_details,
-            "difference": diff_analysis,
-            "comparison_method": "exact_match",
-            "threshold": "100% exact match required"
-        })
-    
-    # Check bill-to name mismatch
-    inv_billto_name = inv_billto.get("name", "")
-    con_client_name = con_client.get("name", "")
-    if inv_billto_name != con_client_name:
-        diff_analysis = _highlight_diff(inv_billto_name, con_client_name)
-        inv_billto_details = _get_string_details(inv_billto_name)
-        con_client_details = _get_string_details(con_client_name)
-        
-        exceptions.append({
-            "type": "bill_to_name_mismatch",
-            "invoice_value": inv_billto_name,
-            "expected_value": con_client_name,
-            "invoice_value_details": inv_billto_details,
-            "expected_value_details": con_client_details,
-            "difference": diff_analysis,
-            "comparison_method": "exact_match",
-            "threshold": "100% exact match required"
-        })
+    # (exception type, invoice value, expected contract value); only exact matches pass
+    checks = (
+        ("supplier_name_mismatch", inv_supplier.get("name", ""), con_supplier.get("name", "")),
+        ("supplier_vendor_id_mismatch", inv_supplier.get("vendor_id", ""), con_supplier.get("vendor_id", "")),
+        ("bill_to_name_mismatch", inv_billto.get("name", ""), con_client.get("name", "")),
+    )
+    for mismatch_type, inv_value, expected_value in checks:
+        if inv_value == expected_value:
+            continue
+        exception: Dict[str, Any] = {
+            "type": mismatch_type,
+            "invoice_value": inv_value,
+            "expected_value": expected_value,
+        }
+        if details:
+            # Detailed exception with annotated values and where they differ
+            exception["invoice_value_details"] = _get_string_details(inv_value)
+            exception["expected_value_details"] = _get_string_details(expected_value)
+            exception["difference"] = _highlight_diff(inv_value, expected_value)
+        exception["comparison_method"] = "exact_match"
+        exception["threshold"] = "100% exact match required"
+        exceptions.append(exception)
 
     return {
         "tool": tool_name,
@@ -1,30 +1,194 @@
+import atexit
+import functools
 import json
+import mmap
 import os
-import uuid
-from datetime import datetime
-from typing import Any, Dict, List
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from secrets import token_hex
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, TextIO, Tuple
 
 from .validation_runner_tool import run_validations
-from .po_contract_resolver_tool import resolve_invoice_to_po_and_contract
+from .po_contract_resolver_tool import (
+    resolve_invoice_to_po_and_contract, resolve_directories, find_invoice_path, _json_files_signature
+)
 from .fuzzy_matching_tool import fuzzy_resolve_invoice_to_po_and_contract
 
 
+# invoice_id values in processed-invoice records; compact separators are
+# still accepted so older logs keep deduplicating
+_PROCESSED_ID_RE = re.compile(rb'"invoice_id": ?"([^"]*)"')
+
+# Logs at least this large are scanned through mmap (or in chunks) instead of being read whole
+_MMAP_SCAN_MIN_BYTES = 1 << 20
+_SCAN_CHUNK_BYTES = 8192
+
+# processed_invoices.log path -> ((size, mtime_ns) when last synced, invoice IDs logged in it)
+_processed_ids_cache: Dict[str, Tuple[Optional[Tuple[int, int]], Set[str]]] = {}
+
+# Open append handles of the logs written so far, by path (see _write_log)
+_log_handles: Dict[str, TextIO] = {}
+_log_handles_lock = threading.Lock()
+
+# (epoch second, formatted UTC timestamp) of the last _ts() call
+_ts_cache = (-1, "")
+
+
 def _ts() -> str:
-    return datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+    # Log lines of one invoice are written within the same second; format once per second
+    global _ts_cache
+    second = int(time.time())
+    cached_second, formatted = _ts_cache
+    if cached_second != second:
+        formatted = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(second))
+        _ts_cache = (second, formatted)
+    return formatted
+
 
+def _new_exception_id() -> str:
+    # EXC- plus 12 uppercase hex digits (48 random bits), straight from os.urandom
+    return f"EXC-{token_hex(6).upper()}"
 
+
+@functools.lru_cache(maxsize=32)
 def _ensure_logs_dir(repo_root: str) -> str:
+    # Created once per root and process; call _ensure_logs_dir.cache_clear() if it is removed
     logs_dir = os.path.join(repo_root, "system_logs")
     os.makedirs(logs_dir, exist_ok=True)
     return logs_dir
 
 
+@functools.lru_cache(maxsize=64)
+def _log_path(logs_dir: str, name: str) -> str:
+    return os.path.join(logs_dir, name)
+
+
+def _write_log(path: str, text: str) -> None:
+    """
+    Append text to a log through a per-path handle kept open between calls.
+    Every write is flushed, so readers (and the dedup size check) see it at
+    once; a log deleted or replaced since the last write is reopened.
+    """
+    with _log_handles_lock:
+        f = _log_handles.get(path)
+        if f is not None:
+            try:
+                current = os.path.samestat(os.fstat(f.fileno()), os.stat(path))
+            except OSError:
+                current = False
+            if not current:
+                f.close()
+                f = None
+        if f is None:
+            f = open(path, "a", encoding="utf-8")
+            _log_handles[path] = f
+        f.write(text)
+        f.flush()
+
+
+def _close_log_handles() -> None:
+    with _log_handles_lock:
+        for f in _log_handles.values():
+            try:
+                f.close()
+            except Exception:
+                pass
+        _log_handles.clear()
+
+
+atexit.register(_close_log_handles)
+
+
 def _append_line(path: str, line: str) -> None:
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(line.rstrip("\n") + "\n")
+    _write_log(path, line.rstrip("\n") + "\n")
+
+
+def _append_lines(path: str, lines: Iterable[str]) -> None:
+    """Append several lines with a single write, same format as _append_line."""
+    payload = "".join(line.rstrip("\n") + "\n" for line in lines)
+    if not payload:
+        return
+    _write_log(path, payload)
+
+
+def _dumps_record(record: Dict[str, Any]) -> str:
+    """Serialize a log record as single-line JSON in json.dumps' default format."""
+    return json.dumps(record)
+
+
+def _log_state(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def _processed_invoice_ids(processed_log: str) -> Set[str]:
+    """
+    Invoice IDs already recorded in processed_log. The log is scanned once per
+    process and rescanned only when it changed other than through
+    _mark_invoice_processed (another process appended, or it was cleared).
+    """
+    state = _log_state(processed_log)
+    cached = _processed_ids_cache.get(processed_log)
+    if cached is not None and cached[0] == state:
+        return cached[1]
+    ids: Set[str] = set()
+    if state is not None:
+        try:
+            # Scan raw bytes and decode only the matched IDs
+            with open(processed_log, "rb") as f:
+                if state[0] >= _MMAP_SCAN_MIN_BYTES:
+                    try:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                            matches = _PROCESSED_ID_RE.findall(data)
+                    except (OSError, ValueError):
+                        # mmap unsupported here (or the file shrank to empty): stream it
+                        f.seek(0)
+                        matches = _scan_ids_chunked(f)
+                else:
+                    matches = _PROCESSED_ID_RE.findall(f.read())
+            ids.update(m.decode("utf-8", "replace") for m in matches)
+        except Exception:
+            # If we can't read the file, continue with logging
+            pass
+    _processed_ids_cache[processed_log] = (state, ids)
+    return ids
+
+
+def _scan_ids_chunked(f: Any) -> List[bytes]:
+    """Match _PROCESSED_ID_RE over a binary file in fixed-size chunks, cut at line ends."""
+    matches: List[bytes] = []
+    tail = b""
+    while True:
+        chunk = f.read(_SCAN_CHUNK_BYTES)
+        if not chunk:
+            break
+        buf = tail + chunk
+        # Records are single lines, so no match straddles the cut
+        cut = buf.rfind(b"\n") + 1
+        matches.extend(_PROCESSED_ID_RE.findall(buf, 0, cut))
+        tail = buf[cut:]
+    matches.extend(_PROCESSED_ID_RE.findall(tail))
+    return matches
+
+
+def _mark_invoice_processed(processed_log: str, ids: Set[str], invoice_id: Any) -> None:
+    """Record an invoice just appended to processed_log, keeping the ID cache in sync."""
+    if isinstance(invoice_id, str):
+        ids.add(invoice_id)
+    _processed_ids_cache[processed_log] = (_log_state(processed_log), ids)
+
+
+def _invoice_amount(invoice_data: Dict[str, Any]) -> float:
+    return float(invoice_data.get("summary", {}).get("billing_amount", 0))
 
 
-def _log_processed_invoice(invoice_data: Dict[str, Any], processing_result: str, logs_dir: str, additional_info: Dict[str, Any] = None) -> None:
+def _log_processed_invoice(invoice_data: Dict[str, Any], processing_result: str, logs_dir: str, additional_info: Dict[str, Any] = None, ts: str = None, amount: float = None) -> None:
     """
     Log every processed invoice to processed_invoices.log for comprehensive audit trail.
     
@@ -33,38 +197,33 @@ def _log_processed_invoice(invoice_data: Dict[str, Any], processing_result: str,
         processing_result: Final processing result (APPROVED, PENDING_APPROVAL, REJECTED)
         logs_dir: Directory containing log files
         additional_info: Additional information like exception_id, routing_queue, etc.
+        ts: Timestamp to record (defaults to now)
+        amount: Invoice billing amount, when the caller has already parsed it
     """
-    processed_log = os.path.join(logs_dir, "processed_invoices.log")
+    processed_log = _log_path(logs_dir, "processed_invoices.log")
     
     # Check if this invoice has already been processed to avoid duplicates
     invoice_id = invoice_data.get("invoice_id", "<unknown>")
-    if os.path.exists(processed_log):
-        try:
-            with open(processed_log, "r", encoding="utf-8") as f:
-                content = f.read()
-                if f'"invoice_id": "{invoice_id}"' in content:
-                    # Invoice already processed, skip logging
-                    return
-        except Exception:
-            # If we can't read the file, continue with logging
-            pass
+    processed_ids = _processed_invoice_ids(processed_log)
+    if isinstance(invoice_id, str) and invoice_id in processed_ids:
+        # Invoice already processed, skip logging
+        return
     
     # Extract key invoice information
-    invoice_id = invoice_data.get("invoice_id", "<unknown>")
     # Handle both supplier and supplier_info structures
     supplier_info = invoice_data.get("supplier_info", invoice_data.get("supplier", {}))
     supplier_name = supplier_info.get("name", "<unknown>")
     vendor_id = supplier_info.get("vendor_id", "<unknown>")
     # Use invoice_id as invoice_number if invoice_number field doesn't exist
-    invoice_number = invoice_data.get("invoice_number", invoice_data.get("invoice_id", "<unknown>"))
-    billing_amount = float(invoice_data.get("summary", {}).get("billing_amount", 0))
+    invoice_number = invoice_data.get("invoice_number", invoice_id)
+    billing_amount = _invoice_amount(invoice_data) if amount is None else amount
     po_number = invoice_data.get("purchase_order_number", "<unknown>")
     line_items_count = len(invoice_data.get("line_items", []))
     issue_date = invoice_data.get("issue_date", "<unknown>")
     
     # Create the processed invoice record
     processed_record = {
-        "timestamp": _ts(),
+        "timestamp": ts or _ts(),
         "invoice_id": invoice_id,
         "supplier_name": supplier_name,
         "vendor_id": vendor_id,
@@ -81,8 +240,9 @@ def _log_processed_invoice(invoice_data: Dict[str, Any], processing_result: str,
         processed_record.update(additional_info)
     
     # Log to processed_invoices.log
-    log_entry = f"PROCESSED: {json.dumps(processed_record)}"
+    log_entry = f"PROCESSED: {_dumps_record(processed_record)}"
     _append_line(processed_log, log_entry)
+    _mark_invoice_processed(processed_log, processed_ids, invoice_id)
 
 
 def _format_fail_reasons(tool_results: List[Dict[str, Any]]) -> List[str]:
@@ -91,19 +251,86 @@ def _format_fail_reasons(tool_results: List[Dict[str, Any]]) -> List[str]:
         if r.get("status") == "FAIL":
             tool = r.get("tool", "tool")
             exc = r.get("exceptions") or []
-            # Handle both string and dict exceptions
-            exc_strs = []
-            for e in exc:
-                if isinstance(e, dict):
-                    exc_strs.append(str(e))
-                else:
-                    exc_strs.append(str(e))
-            msg = f"{tool}: " + ", ".join(exc_strs) if exc_strs else f"{tool}: <no details>"
-            reasons.append(msg)
+            # String and dict exceptions alike are shown via str()
+            details = ", ".join(map(str, exc)) if exc else "<no details>"
+            reasons.append(f"{tool}: {details}")
     return reasons
 
 
-def _determine_routing_queue(tool_results: List[Dict[str, Any]], invoice_data: Dict[str, Any], matching_details: Dict[str, Any]) -> Dict[str, Any]:
+# Routing used when no specific failure applies; every route below overrides some of these fields
+_DEFAULT_ROUTING_INFO = {
+    "queue_name": "general_exceptions",
+    "priority": "normal",
+    "routing_reason": "General validation failure",
+    "requires_manager_approval": False,
+    "confidence_score": 0.0,
+    "specific_issues": []
+}
+
+
+# Routing for a failed dependency check (missing PO or contract)
+_MISSING_DATA_ROUTE = {
+    "queue_name": "missing_data",
+    "priority": "high",
+    "routing_reason": "Missing PO or contract data",
+    "requires_manager_approval": True,
+    "specific_issues": ["missing_po", "missing_contract"]
+}
+
+# (tool, routing when it fails), checked in priority order after the confidence check
+_TOOL_FAILURE_ROUTES = (
+    ("line_item_validation_tool", {
+        "queue_name": "price_discrepancies",
+        "priority": "high",
+        "routing_reason": "Line item validation failed",
+        "requires_manager_approval": True,
+        "specific_issues": ["price_mismatch", "quantity_mismatch"]
+    }),
+    ("supplier_match_tool", {
+        "queue_name": "supplier_mismatch",
+        "priority": "medium",
+        "routing_reason": "Supplier information mismatch",
+        "requires_manager_approval": False,
+        "specific_issues": ["supplier_name_mismatch", "vendor_id_mismatch"]
+    }),
+    ("simple_overbilling_tool", {
+        "queue_name": "billing_discrepancies",
+        "priority": "high",
+        "routing_reason": "Billing amount exceeds PO or arithmetic error",
+        "requires_manager_approval": True,
+        "specific_issues": ["overbilling", "arithmetic_error"]
+    }),
+    ("date_check_tool", {
+        "queue_name": "date_discrepancies",
+        "priority": "medium",
+        "routing_reason": "Date validation failed",
+        "requires_manager_approval": False,
+        "specific_issues": ["date_mismatch", "payment_terms_error"]
+    }),
+)
+
+# Routing for low-confidence matches and high-value invoices (routing_reason is filled in per invoice)
+_LOW_CONFIDENCE_ROUTE = {
+    "queue_name": "low_confidence_matches",
+    "priority": "high",
+    "requires_manager_approval": True,
+    "specific_issues": ["low_po_confidence", "low_supplier_confidence"]
+}
+
+_HIGH_VALUE_ROUTE = {
+    "queue_name": "high_value_approval",
+    "priority": "high",
+    "requires_manager_approval": True,
+    "specific_issues": ["high_value"]
+}
+
+
+def _routing_info(route: Dict[str, Any], **fields: Any) -> Dict[str, Any]:
+    # Default routing overlaid with a route in one copy; fresh specific_issues list as the constants are shared
+    return {**_DEFAULT_ROUTING_INFO, **route, **fields, "specific_issues": list(route["specific_issues"])}
+
+
+def _determine_routing_queue(tool_results: List[Dict[str, Any]], invoice_data: Dict[str, Any], matching_details: Dict[str, Any], amount: float = None) -> Dict[str, Any]:
     """
     Determine the appropriate routing queue based on validation failures and confidence scores.
     
@@ -111,31 +338,20 @@ def _determine_routing_queue(tool_results: List[Dict[str, Any]], invoice_data: D
         tool_results: Results from validation tools
         invoice_data: Invoice data
         matching_details: Details from fuzzy matching
+        amount: Invoice billing amount, when the caller has already parsed it
     
     Returns:
         Dict with queue information and routing decision
     """
-    routing_info = {
-        "queue_name": "general_exceptions",
-        "priority": "normal",
-        "routing_reason": "General validation failure",
-        "requires_manager_approval": False,
-        "confidence_score": 0.0,
-        "specific_issues": []
-    }
-    
+    # First result per tool (as a linear scan would find), so each check is one lookup
+    by_tool: Dict[Any, Dict[str, Any]] = {}
+    for r in tool_results:
+        by_tool.setdefault(r.get("tool"), r)
     
     # Check for missing data issues
-    dependency_tool = next((r for r in tool_results if r.get("tool") == "dependency_check"), None)
+    dependency_tool = by_tool.get("dependency_check")
     if dependency_tool and dependency_tool.get("status") == "FAIL":
-        routing_info.update({
-            "queue_name": "missing_data",
-            "priority": "high",
-            "routing_reason": "Missing PO or contract data",
-            "requires_manager_approval": True,
-            "specific_issues": ["missing_po", "missing_contract"]
-        })
-        return routing_info
+        return _routing_info(_MISSING_DATA_ROUTE)
     
     # Check for low confidence matching
     po_confidence = matching_details.get("po_match", {}).get("confidence", 0.0)
@@ -143,82 +359,495 @@ def _determine_routing_queue(tool_results: List[Dict[str, Any]], invoice_data: D
     overall_confidence = matching_details.get("overall_confidence", 0.0)
     
     if overall_confidence < 0.7:  # Low confidence threshold
-        routing_info.update({
-            "queue_name": "low_confidence_matches",
-            "priority": "high",
-            "routing_reason": f"Low confidence matching ({overall_confidence:.1%})",
-            "requires_manager_approval": True,
-            "confidence_score": overall_confidence,
-            "specific_issues": ["low_po_confidence", "low_supplier_confidence"]
-        })
-        return routing_info
-    
-    # Check for line item validation failures
-    line_item_tool = next((r for r in tool_results if r.get("tool") == "line_item_validation_tool"), None)
-    if line_item_tool and line_item_tool.get("status") == "FAIL":
-        routing_info.update({
-            "queue_name": "price_discrepancies",
-            "priority": "high",
-            "routing_reason": "Line item validation failed",
-            "requires_manager_approval": True,
-            "specific_issues": ["price_mismatch", "quantity_mismatch"]
-        })
-        return routing_info
-    
-    # Check for supplier matching issues
-    supplier_tool = next((r for r in tool_results if r.get("tool") == "supplier_match_tool"), None)
-    if supplier_tool and supplier_tool.get("status") == "FAIL":
-        routing_info.update({
-            "queue_name": "supplier_mismatch",
-            "priority": "medium",
-            "routing_reason": "Supplier information mismatch",
-            "requires_manager_approval": False,
-            "specific_issues": ["supplier_name_mismatch", "vendor_id_mismatch"]
-        })
-        return routing_info
-    
-    # Check for billing/overbilling issues
-    billing_tool = next((r for r in tool_results if r.get("tool") == "simple_overbilling_tool"), None)
-    if billing_tool and billing_tool.get("status") == "FAIL":
-        routing_info.update({
-            "queue_name": "billing_discrepancies",
-            "priority": "high",
-            "routing_reason": "Billing amount exceeds PO or arithmetic error",
-            "requires_manager_approval": True,
-            "specific_issues": ["overbilling", "arithmetic_error"]
-        })
-        return routing_info
-    
-    # Check for date issues
-    date_tool = next((r for r in tool_results if r.get("tool") == "date_check_tool"), None)
-    if date_tool and date_tool.get("status") == "FAIL":
-        routing_info.update({
-            "queue_name": "date_discrepancies",
-            "priority": "medium",
-            "routing_reason": "Date validation failed",
-            "requires_manager_approval": False,
-            "specific_issues": ["date_mismatch", "payment_terms_error"]
-        })
-        return routing_info
+        return _routing_info(
+            _LOW_CONFIDENCE_ROUTE,
+            routing_reason=f"Low confidence matching ({overall_confidence:.1%})",
+            confidence_score=overall_confidence
+        )
+    
+    # Line item, supplier, billing and date failures, in that priority order
+    for tool_name, route in _TOOL_FAILURE_ROUTES:
+        tool_result = by_tool.get(tool_name)
+        if tool_result and tool_result.get("status") == "FAIL":
+            return _routing_info(route)
     
     # Check invoice value for high-value routing
-    invoice_amount = float(invoice_data.get("summary", {}).get("billing_amount", 0))
+    invoice_amount = _invoice_amount(invoice_data) if amount is None else amount
     if invoice_amount > 10000:  # High-value threshold
-        routing_info.update({
-            "queue_name": "high_value_approval",
-            "priority": "high",
-            "routing_reason": f"High-value invoice (${invoice_amount:,.2f})",
-            "requires_manager_approval": True,
-            "specific_issues": ["high_value"]
-        })
-        return routing_info
+        return _routing_info(_HIGH_VALUE_ROUTE, routing_reason=f"High-value invoice (${invoice_amount:,.2f})")
     
-    return routing_info
+    return _routing_info(_DEFAULT_ROUTING_INFO)
+
+
+# Line-item field -> FAILED_RULE; other fields report "<field>_validation"
+_LINE_ITEM_FAILED_RULES = {
+    "unit_price": "unit_price_match",
+    "quantity": "quantity_validation",
+    "line_total": "line_total_calculation"
+}
+
+
+def _handle_line_item(exceptions: List[Any], invoice_data: Dict[str, Any], contract_data: Dict[str, Any], po_item: Dict[str, Any], validation_details: List[str]) -> None:
+    """Append VALIDATION_DETAILS blocks for a failed line_item_validation_tool result."""
+    for exc in exceptions:
+        if isinstance(exc, dict) and exc.get("discrepancies"):
+            item_id = exc.get("item_id", "unknown")
+            description = exc.get("description", "N/A")
+
+            for disc in exc.get("discrepancies", []):
+                if disc.get("status") == "FAIL":
+                    field = disc.get("field", "unknown_field")
+                    inv_value = disc.get("invoice_value")
+                    exp_value = disc.get("po_value") or disc.get("calculated_value")
+
+                    # Format difference
+                    if "difference" in disc:
+                        diff = disc.get("difference")
+                        if isinstance(diff, (int, float)):
+                            diff_str = f"{diff:,.2f}"
+                        else:
+                            diff_str = str(diff)
+                    elif "excess" in disc:
+                        excess = disc.get("excess")
+                        pct = disc.get("percentage_excess", 0)
+                        diff_str = f"{excess} ({pct}% excess)"
+                    else:
+                        diff_str = "N/A"
+
+                    # Determine failed rule and comparison method
+                    failed_rule = _LINE_ITEM_FAILED_RULES.get(field) or f"{field}_validation"
+                    comparison_method = "exact_match" if field != "quantity" else "upper_bound_validation"
+
+                    # Format failure reason
+                    if field == "unit_price":
+                        if isinstance(inv_value, (int, float)) and isinstance(exp_value, (int, float)):
+                            diff_val = abs(inv_value - exp_value)
+                            pct = (diff_val / exp_value * 100) if exp_value != 0 else 0
+                            reason = f"Unit price exceeds PO unit price by ${diff_val:.2f} ({pct:.2f}%)"
+                            threshold = "100% exact match required"
+                        else:
+                            reason = f"Unit price mismatch: Invoice {inv_value} vs PO {exp_value}"
+                            threshold = "N/A"
+                    elif field == "quantity":
+                        if "excess" in disc:
+                            excess = disc.get("excess")
+                            pct = disc.get("percentage_excess", 0)
+                            reason = f"Quantity exceeds PO quantity by {excess} units ({pct}%)"
+                            threshold = "Invoice quantity must not exceed PO quantity"
+                        else:
+                            reason = f"Quantity mismatch: Invoice {inv_value} vs PO {exp_value}"
+                            threshold = "N/A"
+                    elif field == "line_total":
+                        reason = f"Line total calculation error: ${inv_value} vs expected ${exp_value}"
+                        threshold = "Line total must equal unit_price × quantity (within rounding)"
+                    else:
+                        reason = f"Validation failed for {field}: {inv_value} vs {exp_value}"
+                        threshold = "N/A"
+
+                    validation_details.extend((
+                        "Tool: line_item_validation_tool",
+                        f"Field: {field}",
+                        f"FAILED_RULE: {failed_rule}",
+                        f"INVOICE_VALUE: {inv_value}",
+                        f"EXPECTED_VALUE: {exp_value}",
+                        f"DIFFERENCE: {diff_str}",
+                        f"COMPARISON_METHOD: {comparison_method}",
+                        f"THRESHOLD: {threshold}",
+                        f"FAILURE_REASON: {reason}",
+                        "",  # Empty line between blocks
+                    ))
+
+
+def _legacy_supplier_names(invoice_data: Dict[str, Any], contract_data: Dict[str, Any]) -> Tuple[Any, Any]:
+    """Invoice and contract supplier names reported for legacy supplier_match_tool exceptions."""
+    invoice_supplier = "Unknown"
+    contract_supplier = "Unknown"
+
+    if invoice_data:
+        inv_supplier_info = invoice_data.get("supplier_info", {})
+        if isinstance(inv_supplier_info, dict):
+            invoice_supplier = inv_supplier_info.get("name", "Unknown")
+        elif isinstance(inv_supplier_info, str):
+            invoice_supplier = inv_supplier_info
+
+    if contract_data:
+        parties = contract_data.get("parties", {})
+        con_supplier = parties.get("supplier", {})
+        if isinstance(con_supplier, dict):
+            contract_supplier = con_supplier.get("name", "Unknown")
+
+    return invoice_supplier, contract_supplier
+
+
+def _handle_supplier(exceptions: List[Any], invoice_data: Dict[str, Any], contract_data: Dict[str, Any], po_item: Dict[str, Any], validation_details: List[str]) -> None:
+    """Append VALIDATION_DETAILS blocks for a failed supplier_match_tool result."""
+    supplier_names = None
+    # Supplier mismatch - handle detailed exception information
+    for exc in exceptions:
+        # Check if this is a detailed exception dict or legacy string
+        if isinstance(exc, dict):
+            # New detailed exception format
+            exc_type = exc.get("type", "supplier_name_mismatch")
+            invoice_value = exc.get("invoice_value", "Unknown")
+            expected_value = exc.get("expected_value", "Unknown")
+            invoice_details = exc.get("invoice_value_details", "")
+            expected_details = exc.get("expected_value_details", "")
+            difference = exc.get("difference", "N/A")
+            comparison_method = exc.get("comparison_method", "exact_match")
+            threshold = exc.get("threshold", "N/A")
+
+            # Determine field and rule based on exception type
+            if "vendor_id" in exc_type:
+                field = "supplier_vendor_id"
+                failed_rule = "supplier_vendor_id_match"
+            elif "bill_to" in exc_type:
+                field = "bill_to_name"
+                failed_rule = "bill_to_match"
+            else:
+                field = "supplier_name"
+                failed_rule = "supplier_match"
+
+            # Create detailed failure reason
+            failure_reason = f"Supplier mismatch: '{invoice_value}' vs '{expected_value}'. {difference}. Method: {comparison_method}, Threshold: {threshold}"
+
+            validation_details.extend((
+                "Tool: supplier_match_tool",
+                f"Field: {field}",
+                f"FAILED_RULE: {failed_rule}",
+                f"INVOICE_VALUE: {invoice_value}",
+                f"EXPECTED_VALUE: {expected_value}",
+                f"INVOICE_DETAILS: {invoice_details}",
+                f"EXPECTED_DETAILS: {expected_details}",
+                f"DIFFERENCE: {difference}",
+                f"COMPARISON_METHOD: {comparison_method}",
+                f"THRESHOLD: {threshold}",
+                f"FAILURE_REASON: {failure_reason}",
+                "",
+            ))
+        else:
+            # Legacy string format - extract from invoice/contract data (same for every exception)
+            if supplier_names is None:
+                supplier_names = _legacy_supplier_names(invoice_data, contract_data)
+            invoice_supplier, contract_supplier = supplier_names
+
+            # Check what specific mismatches occurred
+            failed_rule = "supplier_match"
+            field = "supplier_name"
+            failure_reason = f"Supplier name mismatch between invoice and PO: '{invoice_supplier}' vs '{contract_supplier}'"
+
+            if "vendor_id" in str(exc).lower():
+                field = "supplier_vendor_id"
+                failed_rule = "supplier_vendor_id_match"
+                failure_reason = "Supplier vendor ID mismatch between invoice and PO"
+
+            validation_details.extend((
+                "Tool: supplier_match_tool",
+                f"Field: {field}",
+                f"FAILED_RULE: {failed_rule}",
+                f"INVOICE_VALUE: {invoice_supplier}",
+                f"EXPECTED_VALUE: {contract_supplier}",
+                "DIFFERENCE: N/A",
+                "COMPARISON_METHOD: exact_match",
+                "THRESHOLD: 100% exact match required",
+                f"FAILURE_REASON: {failure_reason}",
+                "",
+            ))
+
+
+# One formatter per exception type of the tools whose exceptions carry a "type" (see _EXCEPTION_FORMATTERS)
+def _format_billing_mismatch(exc: Any, validation_details: List[str]) -> None:
+    validation_details.extend((
+        "Tool: simple_overbilling_tool",
+        "Field: billing_amount",
+        "FAILED_RULE: billing_arithmetic_validation",
+        f"INVOICE_VALUE: ${exc.get('invoice_billing_amount', 'Unknown')}",
+        f"EXPECTED_VALUE: ${exc.get('calculated_total', 'Unknown')} (subtotal ${exc.get('invoice_subtotal', 0)} + tax ${exc.get('invoice_tax', 0)})",
+        f"DIFFERENCE: ${exc.get('difference', 'N/A')}",
+        f"COMPARISON_METHOD: {exc.get('comparison_method', 'N/A')}",
+        f"THRESHOLD: {exc.get('threshold', 'N/A')}",
+        f"FAILURE_REASON: {exc.get('message', 'Billing amount calculation mismatch')}",
+        "",
+    ))
+
+
+def _format_invoice_exceeds_po(exc: Any, validation_details: List[str]) -> None:
+    validation_details.extend((
+        "Tool: simple_overbilling_tool",
+        "Field: total_amount",
+        "FAILED_RULE: invoice_amount_validation",
+        f"INVOICE_VALUE: ${exc.get('invoice_total', 'Unknown')}",
+        f"EXPECTED_VALUE: ${exc.get('po_total_value', 'Unknown')} (PO total)",
+        f"DIFFERENCE: ${exc.get('excess', 'N/A')} ({exc.get('percentage_excess', 0)}% excess)",
+        f"COMPARISON_METHOD: {exc.get('comparison_method', 'N/A')}",
+        f"THRESHOLD: {exc.get('threshold', 'N/A')}",
+        f"FAILURE_REASON: Invoice total exceeds PO total by ${exc.get('excess', 0)} ({exc.get('percentage_excess', 0)}%)",
+        "",
+    ))
+
+
+def _format_billing_legacy(exc: Any, validation_details: List[str]) -> None:
+    validation_details.extend((
+        "Tool: simple_overbilling_tool",
+        "Field: billing_amount",
+        "FAILED_RULE: billing_validation",
+        "INVOICE_VALUE: Unknown",
+        "EXPECTED_VALUE: Unknown",
+        "DIFFERENCE: N/A",
+        f"FAILURE_REASON: {str(exc)}",
+        "",
+    ))
+
+
+def _format_content_mismatch(exc: Any, validation_details: List[str]) -> None:
+    validation_details.extend((
+        "Tool: content_validation_tool",
+        f"Field: item_{exc.get('item_id', 'unknown')}_description",
+        "FAILED_RULE: content_similarity_validation",
+        f"INVOICE_VALUE: '{exc.get('invoice_description', 'N/A')}'",
+        f"EXPECTED_VALUE: '{exc.get('po_description', 'N/A')}'",
+        f"DIFFERENCE: Similarity score {exc.get('similarity_score', 'N/A')} (below threshold {exc.get('threshold', 'N/A')})",
+        f"COMPARISON_METHOD: {exc.get('comparison_method', 'N/A')}",
+        f"THRESHOLD: {exc.get('threshold', 'N/A')}",
+        f"FAILURE_REASON: Content mismatch for item {exc.get('item_id', 'N/A')}: descriptions don't match",
+        "",
+    ))
+
+
+def _format_suspicious_content(exc: Any, validation_details: List[str]) -> None:
+    validation_details.extend((
+        "Tool: content_validation_tool",
+        f"Field: item_{exc.get('item_id', 'unknown')}_description",
+        "FAILED_RULE: content_safety_validation",
+        f"INVOICE_VALUE: '{exc.get('description', 'N/A')}'",
+        "EXPECTED_VALUE: Clean business description",
+        f"DIFFERENCE: Contains suspicious keyword: '{exc.get('suspicious_keyword', 'N/A')}'",
+        f"COMPARISON_METHOD: {exc.get('comparison_method', 'N/A')}",
+        f"THRESHOLD: {exc.get('threshold', 'N/A')}",
+        f"FAILURE_REASON: Suspicious content detected in item {exc.get('item_id', 'N/A')}",
+        "",
+    ))
+
+
+def _format_missing_line_items(exc: Any, validation_details: List[str]) -> None:
+    validation_details.extend((
+        "Tool: content_validation_tool",
+        "Field: line_items",
+        "FAILED_RULE: content_completeness_validation",
+        f"INVOICE_VALUE: {exc.get('invoice_line_items_count', 0)} line items",
+        f"EXPECTED_VALUE: {exc.get('expected', 'At least 1 line item')}",
+        "DIFFERENCE: N/A",
+        f"COMPARISON_METHOD: {exc.get('comparison_method', 'N/A')}",
+        f"THRESHOLD: {exc.get('threshold', 'N/A')}",
+        f"FAILURE_REASON: Missing required line items",
+        "",
+    ))
+
+
+def _format_content_legacy(exc: Any, validation_details: List[str]) -> None:
+    validation_details.extend((
+        "Tool: content_validation_tool",
+        "Field: content_match",
+        "FAILED_RULE: content_validation",
+        "INVOICE_VALUE: N/A",
+        "EXPECTED_VALUE: N/A",
+        "DIFFERENCE: N/A",
+        f"FAILURE_REASON: {str(exc)}",
+        "",
+    ))
 
 
-def _generate_validation_details(tool_results: List[Dict[str, Any]], invoice_data: Dict[str, Any] = None, contract_data: Dict[str, Any] = None, po_item: Dict[str, Any] = None) -> str:
+def _format_date_out_of_window(exc: Any, validation_details: List[str]) -> None:
+    validation_details.extend((
+        "Tool: date_check_tool",
+        "Field: issue_date",
+        "FAILED_RULE: date_range_validation",
+        f"INVOICE_VALUE: {exc.get('invoice_issue_date', 'N/A')}",
+        f"EXPECTED_VALUE: {exc.get('expected_range', 'N/A')}",
+        f"DIFFERENCE: {exc.get('days_out_of_range', 'N/A')} days outside window",
+        f"COMPARISON_METHOD: {exc.get('comparison_method', 'N/A')}",
+        f"THRESHOLD: {exc.get('threshold', 'N/A')}",
+        f"FAILURE_REASON: Invoice issue date ({exc.get('invoice_issue_date', 'N/A')}) is outside contract window ({exc.get('expected_range', 'N/A')}) by {exc.get('days_out_of_range', 'N/A')} days",
+        "",
+    ))
+
+
+def _format_due_date_not_net30(exc: Any, validation_details: List[str]) -> None:
+    validation_details.extend((
+        "Tool: date_check_tool",
+        "Field: due_date",
+        "FAILED_RULE: payment_terms_validation",
+        f"INVOICE_VALUE: {exc.get('invoice_due_date', 'N/A')}",
+        f"EXPECTED_VALUE: {exc.get('expected_due_date', 'N/A')} (issue date + 30 days)",
+        f"DIFFERENCE: {exc.get('days_difference', 'N/A')} days",
+        f"COMPARISON_METHOD: {exc.get('comparison_method', 'N/A')}",
+        f"THRESHOLD: {exc.get('threshold', 'N/A')}",
+        f"FAILURE_REASON: Due date ({exc.get('invoice_due_date', 'N/A')}) should be Net 30 from issue date ({exc.get('invoice_issue_date', 'N/A')})",
+        "",
+    ))
+
+
+def _format_issue_before_po_date(exc: Any, validation_details: List[str]) -> None:
+    validation_details.extend((
+        "Tool: date_check_tool",
+        "Field: issue_date",
+        "FAILED_RULE: po_date_validation",
+        f"INVOICE_VALUE: {exc.get('invoice_issue_date', 'N/A')}",
+        f"EXPECTED_VALUE: {exc.get('po_effective_date', 'N/A')} or later",
+        f"DIFFERENCE: {exc.get('days_before', 'N/A')} days before PO effective date",
+        f"COMPARISON_METHOD: {exc.get('comparison_method', 'N/A')}",
+        f"THRESHOLD: {exc.get('threshold', 'N/A')}",
+        f"FAILURE_REASON: Invoice issue date ({exc.get('invoice_issue_date', 'N/A')}) is {exc.get('days_before', 'N/A')} days before PO effective date ({exc.get('po_effective_date', 'N/A')})",
+        "",
+    ))
+
+
+def _format_date_parse_error(exc: Any, validation_details: List[str]) -> None:
+    validation_details.extend((
+        "Tool: date_check_tool",
+        "Field: date_parsing",
+        "FAILED_RULE: date_format_validation",
+        f"INVOICE_VALUE: {exc.get('issue_date', exc.get('due_date', exc.get('effective_date', exc.get('end_date', 'N/A'))))}",
+        f"EXPECTED_VALUE: YYYY-MM-DD format",
+        f"DIFFERENCE: N/A",
+        f"COMPARISON_METHOD: format_validation",
+        f"THRESHOLD: {exc.get('required_format', 'YYYY-MM-DD')}",
+        f"FAILURE_REASON: Date parsing error: {exc.get('error', 'Unknown error')}",
+        "",
+    ))
+
+
+def _format_date_legacy(exc: Any, validation_details: List[str]) -> None:
+    validation_details.extend((
+        "Tool: date_check_tool",
+        "Field: date_validation",
+        "FAILED_RULE: date_validation",
+        "INVOICE_VALUE: N/A",
+        "EXPECTED_VALUE: N/A",
+        "DIFFERENCE: N/A",
+        f"FAILURE_REASON: {str(exc)}",
+        "",
+    ))
+
+
+# Tool name -> exception "type" -> formatter; types without an entry contribute nothing
+_EXCEPTION_FORMATTERS: Dict[str, Dict[str, Callable[[Any, List[str]], None]]] = {
+    "simple_overbilling_tool": {
+        "billing_amount_mismatch": _format_billing_mismatch,
+        "invoice_exceeds_po": _format_invoice_exceeds_po,
+    },
+    "content_validation_tool": {
+        "content_mismatch": _format_content_mismatch,
+        "suspicious_content": _format_suspicious_content,
+        "missing_line_items": _format_missing_line_items,
+    },
+    "date_check_tool": {
+        "invoice_issue_out_of_contract_window": _format_date_out_of_window,
+        "due_date_not_net30": _format_due_date_not_net30,
+        "invoice_issue_before_po_effective_date": _format_issue_before_po_date,
+    },
+}
+
+# Tool name -> formatter for legacy (non-dict) exceptions
+_LEGACY_EXCEPTION_FORMATTERS: Dict[str, Callable[[Any, List[str]], None]] = {
+    "simple_overbilling_tool": _format_billing_legacy,
+    "content_validation_tool": _format_content_legacy,
+    "date_check_tool": _format_date_legacy,
+}
+
+
+def _handle_typed_exceptions(tool_name: str, exceptions: List[Any], invoice_data: Dict[str, Any], contract_data: Dict[str, Any], po_item: Dict[str, Any], validation_details: List[str]) -> None:
+    """Append VALIDATION_DETAILS blocks for a failed tool result, formatting each exception by its type."""
+    formatters = _EXCEPTION_FORMATTERS[tool_name]
+    for exc in exceptions:
+        if isinstance(exc, dict):
+            exc_type = exc.get("type", "")
+            format_exc = formatters.get(exc_type)
+            if format_exc is None and tool_name == "date_check_tool" and "parse_error" in exc_type:
+                # invoice_date_parse_error, contract_date_parse_error, ... share one block
+                format_exc = _format_date_parse_error
+            if format_exc is not None:
+                format_exc(exc, validation_details)
+        else:
+            _LEGACY_EXCEPTION_FORMATTERS[tool_name](exc, validation_details)
+
+
+def _handle_currency(exceptions: List[Any], invoice_data: Dict[str, Any], contract_data: Dict[str, Any], po_item: Dict[str, Any], validation_details: List[str]) -> None:
+    """Append VALIDATION_DETAILS blocks for a failed currency_validation_tool result."""
+    # Currency validation issues - handle new detailed exception format
+    for exc in exceptions:
+        if isinstance(exc, dict):
+            validation_details.extend((
+                "Tool: currency_validation_tool",
+                "Field: currency",
+                f"FAILED_RULE: {exc.get('type', 'currency_validation')}",
+                f"INVOICE_VALUE: {exc.get('invoice_currency', 'N/A')}",
+                f"EXPECTED_VALUE: {exc.get('supported_currencies', exc.get('contract_currency', exc.get('expected_format', 'N/A')))}",
+                "DIFFERENCE: N/A",
+                f"COMPARISON_METHOD: {exc.get('comparison_method', 'N/A')}",
+                f"THRESHOLD: {exc.get('threshold', 'N/A')}",
+                f"FAILURE_REASON: {exc.get('type', 'Currency validation failed')} - {exc.get('invoice_currency', 'Unknown currency')}",
+                "",
+            ))
+        else:
+            # Legacy string format
+            validation_details.extend((
+                "Tool: currency_validation_tool",
+                "Field: currency",
+                "FAILED_RULE: currency_validation",
+                "INVOICE_VALUE: Unknown",
+                "EXPECTED_VALUE: USD",
+                "DIFFERENCE: N/A",
+                f"FAILURE_REASON: {str(exc)}",
+                "",
+            ))
+
+
+def _handle_payment_terms(exceptions: List[Any], invoice_data: Dict[str, Any], contract_data: Dict[str, Any], po_item: Dict[str, Any], validation_details: List[str]) -> None:
+    """Append VALIDATION_DETAILS blocks for a failed payment_terms_validation_tool result."""
+    # Payment terms validation issues - handle new detailed exception format
+    for exc in exceptions:
+        if isinstance(exc, dict):
+            validation_details.extend((
+                "Tool: payment_terms_validation_tool",
+                "Field: payment_terms",
+                f"FAILED_RULE: {exc.get('type', 'payment_terms_validation')}",
+                f"INVOICE_VALUE: {exc.get('invoice_terms', 'N/A')}",
+                f"EXPECTED_VALUE: {exc.get('supported_terms', exc.get('contract_terms', exc.get('expected_format', 'N/A')))}",
+                "DIFFERENCE: N/A",
+                f"COMPARISON_METHOD: {exc.get('comparison_method', 'N/A')}",
+                f"THRESHOLD: {exc.get('threshold', 'N/A')}",
+                f"FAILURE_REASON: {exc.get('type', 'Payment terms validation failed')} - {exc.get('invoice_terms', 'Unknown terms')}",
+                "",
+            ))
+        else:
+            # Legacy string format
+            validation_details.extend((
+                "Tool: payment_terms_validation_tool",
+                "Field: payment_terms",
+                "FAILED_RULE: payment_terms_validation",
+                "INVOICE_VALUE: Unknown",
+                "EXPECTED_VALUE: Net 30",
+                "DIFFERENCE: N/A",
+                f"FAILURE_REASON: {str(exc)}",
+                "",
+            ))
+
+
+# Tool name -> VALIDATION_DETAILS handler; tools without an entry contribute nothing
+_VALIDATION_DETAIL_HANDLERS: Dict[str, Callable[[List[Any], Dict[str, Any], Dict[str, Any], Dict[str, Any], List[str]], None]] = {
+    "line_item_validation_tool": _handle_line_item,
+    "supplier_match_tool": _handle_supplier,
+    "simple_overbilling_tool": functools.partial(_handle_typed_exceptions, "simple_overbilling_tool"),
+    "content_validation_tool": functools.partial(_handle_typed_exceptions, "content_validation_tool"),
+    "date_check_tool": functools.partial(_handle_typed_exceptions, "date_check_tool"),
+    "currency_validation_tool": _handle_currency,
+    "payment_terms_validation_tool": _handle_payment_terms,
+}
+
+
+def _generate_validation_details(tool_results: List[Dict[str, Any]], invoice_data: Dict[str, Any] = None, contract_data: Dict[str, Any] = None, po_item: Dict[str, Any] = None) -> List[str]:
     """
-    Generate structured VALIDATION_DETAILS section from tool results.
+    Generate structured VALIDATION_DETAILS lines from tool results.
     
     Args:
         tool_results: List of validation tool results
@@ -227,386 +856,135 @@ def _generate_validation_details(tool_results: List[Dict[str, Any]], invoice_dat
         po_item: Purchase order item data dictionary
     
     Returns:
-        Multi-line string with validation details or empty string if no failures
+        Validation detail lines (joined by the caller) or an empty list if no failures
     """
     validation_details = []
     
     for tool_result in tool_results:
-        tool_name = tool_result.get("tool", "unknown_tool")
-        tool_status = tool_result.get("status")
-        
         # Only process failed tools
-        if tool_status != "FAIL":
+        if tool_result.get("status") != "FAIL":
             continue
         
-        exceptions = tool_result.get("exceptions", [])
-        
-        # Handle different tool types
-        if tool_name == "line_item_validation_tool":
-            for exc in exceptions:
-                if isinstance(exc, dict) and exc.get("discrepancies"):
-                    item_id = exc.get("item_id", "unknown")
-                    description = exc.get("description", "N/A")
-                    
-                    for disc in exc.get("discrepancies", []):
-                        if disc.get("status") == "FAIL":
-                            field = disc.get("field", "unknown_field")
-                            inv_value = disc.get("invoice_value")
-                            exp_value = disc.get("po_value") or disc.get("calculated_value")
-                            
-                            # Format difference
-                            if "difference" in disc:
-                                diff = disc.get("difference")
-                                if isinstance(diff, (int, float)):
-                                    diff_str = f"{diff:,.2f}"
-                                else:
-                                    diff_str = str(diff)
-                            elif "excess" in disc:
-                                excess = disc.get("excess")
-                                pct = disc.get("percentage_excess", 0)
-                                diff_str = f"{excess} ({pct}% excess)"
-                            else:
-                                diff_str = "N/A"
-                            
-                            # Determine failed rule and comparison method
-                            failed_rule_map = {
-                                "unit_price": "unit_price_match",
-                                "quantity": "quantity_validation",
-                                "line_total": "line_total_calculation"
-                            }
-                            failed_rule = failed_rule_map.get(field, f"{field}_validation")
-                            comparison_method = "exact_match" if field != "quantity" else "upper_bound_validation"
-                            
-                            # Format failure reason
-                            if field == "unit_price":
-                                if isinstance(inv_value, (int, float)) and isinstance(exp_value, (int, float)):
-                                    diff_val = abs(inv_value - exp_value)
-                                    pct = (diff_val / exp_value * 100) if exp_value != 0 else 0
-                                    reason = f"Unit price exceeds PO unit price by ${diff_val:.2f} ({pct:.2f}%)"
-                                    threshold = "100% exact match required"
-                                else:
-                                    reason = f"Unit price mismatch: Invoice {inv_value} vs PO {exp_value}"
-                                    threshold = "N/A"
-                            elif field == "quantity":
-                                if "excess" in disc:
-                                    excess = disc.get("excess")
-                                    pct = disc.get("percentage_excess", 0)
-                                    reason = f"Quantity exceeds PO quantity by {excess} units ({pct}%)"
-                                    threshold = "Invoice quantity must not exceed PO quantity"
-                                else:
-                                    reason = f"Quantity mismatch: Invoice {inv_value} vs PO {exp_value}"
-                                    threshold = "N/A"
-                            elif field == "line_total":
-                                reason = f"Line total calculation error: ${inv_value} vs expected ${exp_value}"
-                                threshold = "Line total must equal unit_price × quantity (within rounding)"
-                            else:
-                                reason = f"Validation failed for {field}: {inv_value} vs {exp_value}"
-                                threshold = "N/A"
-                            
-                            validation_details.append(f"Tool: {tool_name}")
-                            validation_details.append(f"Field: {field}")
-                            validation_details.append(f"FAILED_RULE: {failed_rule}")
-                            validation_details.append(f"INVOICE_VALUE: {inv_value}")
-                            validation_details.append(f"EXPECTED_VALUE: {exp_value}")
-                            validation_details.append(f"DIFFERENCE: {diff_str}")
-                            validation_details.append(f"COMPARISON_METHOD: {comparison_method}")
-                            validation_details.append(f"THRESHOLD: {threshold}")
-                            validation_details.append(f"FAILURE_REASON: {reason}")
-                            validation_details.append("")  # Empty line between blocks
-        
-        elif tool_name == "supplier_match_tool":
-            # Supplier mismatch - handle detailed exception information
-            if exceptions:
-                for exc in exceptions:
-                    # Check if this is a detailed exception dict or legacy string
-                    if isinstance(exc, dict):
-                        # New detailed exception format
-                        exc_type = exc.get("type", "supplier_name_mismatch")
-                        invoice_value = exc.get("invoice_value", "Unknown")
-                        expected_value = exc.get("expected_value", "Unknown")
-                        invoice_details = exc.get("invoice_value_details", "")
-                        expected_details = exc.get("expected_value_details", "")
-                        difference = exc.get("difference", "N/A")
-                        comparison_method = exc.get("comparison_method", "exact_match")
-                        threshold = exc.get("threshold", "N/A")
-                        
-                        # Determine field and rule based on exception type
-                        if "vendor_id" in exc_type:
-                            field = "supplier_vendor_id"
-                            failed_rule = "supplier_vendor_id_match"
-                        elif "bill_to" in exc_type:
-                            field = "bill_to_name"
-                            failed_rule = "bill_to_match"
-                        else:
-                            field = "supplier_name"
-                            failed_rule = "supplier_match"
-                        
-                        # Create detailed failure reason
-                        failure_reason = f"Supplier mismatch: '{invoice_value}' vs '{expected_value}'. {difference}. Method: {comparison_method}, Threshold: {threshold}"
-                        
-                        validation_details.append("Tool: supplier_match_tool")
-                        validation_details.append(f"Field: {field}")
-                        validation_details.append(f"FAILED_RULE: {failed_rule}")
-                        validation_details.append(f"INVOICE_VALUE: {invoice_value}")
-                        validation_details.append(f"EXPECTED_VALUE: {expected_value}")
-                        validation_details.append(f"INVOICE_DETAILS: {invoice_details}")
-                        validation_details.append(f"EXPECTED_DETAILS: {expected_details}")
-                        validation_details.append(f"DIFFERENCE: {difference}")
-                        validation_details.append(f"COMPARISON_METHOD: {comparison_method}")
-                        validation_details.append(f"THRESHOLD: {threshold}")
-                        validation_details.append(f"FAILURE_REASON: {failure_reason}")
-                        validation_details.append("")
-                    else:
-                        # Legacy string format - extract from invoice/contract data
-                        invoice_supplier = "Unknown"
-                        contract_supplier = "Unknown"
-                        
-                        if invoice_data:
-                            inv_supplier_info = invoice_data.get("supplier_info", {})
-                            if isinstance(inv_supplier_info, dict):
-                                invoice_supplier = inv_supplier_info.get("name", "Unknown")
-                            elif isinstance(inv_supplier_info, str):
-                                invoice_supplier = inv_supplier_info
-                        
-                        if contract_data:
-                            parties = contract_data.get("parties", {})
-                            con_supplier = parties.get("supplier", {})
-                            if isinstance(con_supplier, dict):
-                                contract_supplier = con_supplier.get("name", "Unknown")
-                        
-                        # Check what specific mismatches occurred
-                        failed_rule = "supplier_match"
-                        field = "supplier_name"
-                        failure_reason = f"Supplier name mismatch between invoice and PO: '{invoice_supplier}' vs '{contract_supplier}'"
-                        
-                        if "vendor_id" in str(exc).lower():
-                            field = "supplier_vendor_id"
-                            failed_rule = "supplier_vendor_id_match"
-                            failure_reason = "Supplier vendor ID mismatch between invoice and PO"
-                        
-                        validation_details.append("Tool: supplier_match_tool")
-                        validation_details.append(f"Field: {field}")
-                        validation_details.append(f"FAILED_RULE: {failed_rule}")
-                        validation_details.append(f"INVOICE_VALUE: {invoice_supplier}")
-                        validation_details.append(f"EXPECTED_VALUE: {contract_supplier}")
-                        validation_details.append("DIFFERENCE: N/A")
-                        validation_details.append("COMPARISON_METHOD: exact_match")
-                        validation_details.append("THRESHOLD: 100% exact match required")
-                        validation_details.append(f"FAILURE_REASON: {failure_reason}")
-                        validation_details.append("")
-        
-        elif tool_name == "simple_overbilling_tool":
-            # Billing issues - handle new detailed exception format
-            if exceptions:
-                for exc in exceptions:
-                    if isinstance(exc, dict):
-                        exc_type = exc.get("type", "")
-                        if exc_type == "billing_amount_mismatch":
-                            validation_details.append("Tool: simple_overbilling_tool")
-                            validation_details.append("Field: billing_amount")
-                            validation_details.append("FAILED_RULE: billing_arithmetic_validation")
-                            validation_details.append(f"INVOICE_VALUE: ${exc.get('invoice_billing_amount', 'Unknown')}")
-                            validation_details.append(f"EXPECTED_VALUE: ${exc.get('calculated_total', 'Unknown')} (subtotal ${exc.get('invoice_subtotal', 0)} + tax ${exc.get('invoice_tax', 0)})")
-                            validation_details.append(f"DIFFERENCE: ${exc.get('difference', 'N/A')}")
-                            validation_details.append(f"COMPARISON_METHOD: {exc.get('comparison_method', 'N/A')}")
-                            validation_details.append(f"THRESHOLD: {exc.get('threshold', 'N/A')}")
-                            validation_details.append(f"FAILURE_REASON: {exc.get('message', 'Billing amount calculation mismatch')}")
-                            validation_details.append("")
-                        elif exc_type == "invoice_exceeds_po":
-                            validation_details.append("Tool: simple_overbilling_tool")
-                            validation_details.append("Field: total_amount")
-                            validation_details.append("FAILED_RULE: invoice_amount_validation")
-                            validation_details.append(f"INVOICE_VALUE: ${exc.get('invoice_total', 'Unknown')}")
-                            validation_details.append(f"EXPECTED_VALUE: ${exc.get('po_total_value', 'Unknown')} (PO total)")
-                            validation_details.append(f"DIFFERENCE: ${exc.get('excess', 'N/A')} ({exc.get('percentage_excess', 0)}% excess)")
-                            validation_details.append(f"COMPARISON_METHOD: {exc.get('comparison_method', 'N/A')}")
-                            validation_details.append(f"THRESHOLD: {exc.get('threshold', 'N/A')}")
-                            validation_details.append(f"FAILURE_REASON: Invoice total exceeds PO total by ${exc.get('excess', 0)} ({exc.get('percentage_excess', 0)}%)")
-                            validation_details.append("")
-                    else:
-                        # Legacy string format
-                        validation_details.append("Tool: simple_overbilling_tool")
-                        validation_details.append("Field: billing_amount")
-                        validation_details.append("FAILED_RULE: billing_validation")
-                        validation_details.append("INVOICE_VALUE: Unknown")
-                        validation_details.append("EXPECTED_VALUE: Unknown")
-                        validation_details.append("DIFFERENCE: N/A")
-                        validation_details.append(f"FAILURE_REASON: {str(exc)}")
-                        validation_details.append("")
-        
-        elif tool_name == "content_validation_tool":
-            # Content validation issues - handle new detailed exception format
-            if exceptions:
-                for exc in exceptions:
-                    if isinstance(exc, dict):
-                        exc_type = exc.get("type", "")
-                        if exc_type == "content_mismatch":
-                            validation_details.append("Tool: content_validation_tool")
-                            validation_details.append(f"Field: item_{exc.get('item_id', 'unknown')}_description")
-                            validation_details.append("FAILED_RULE: content_similarity_validation")
-                            validation_details.append(f"INVOICE_VALUE: '{exc.get('invoice_description', 'N/A')}'")
-                            validation_details.append(f"EXPECTED_VALUE: '{exc.get('po_description', 'N/A')}'")
-                            validation_details.append(f"DIFFERENCE: Similarity score {exc.get('similarity_score', 'N/A')} (below threshold {exc.get('threshold', 'N/A')})")
-                            validation_details.append(f"COMPARISON_METHOD: {exc.get('comparison_method', 'N/A')}")
-                            validation_details.append(f"THRESHOLD: {exc.get('threshold', 'N/A')}")
-                            validation_details.append(f"FAILURE_REASON: Content mismatch for item {exc.get('item_id', 'N/A')}: descriptions don't match")
-                            validation_details.append("")
-                        elif exc_type == "suspicious_content":
-                            validation_details.append("Tool: content_validation_tool")
-                            validation_details.append(f"Field: item_{exc.get('item_id', 'unknown')}_description")
-                            validation_details.append("FAILED_RULE: content_safety_validation")
-                            validation_details.append(f"INVOICE_VALUE: '{exc.get('description', 'N/A')}'")
-                            validation_details.append("EXPECTED_VALUE: Clean business description")
-                            validation_details.append(f"DIFFERENCE: Contains suspicious keyword: '{exc.get('suspicious_keyword', 'N/A')}'")
-                            validation_details.append(f"COMPARISON_METHOD: {exc.get('comparison_method', 'N/A')}")
-                            validation_details.append(f"THRESHOLD: {exc.get('threshold', 'N/A')}")
-                            validation_details.append(f"FAILURE_REASON: Suspicious content detected in item {exc.get('item_id', 'N/A')}")
-                            validation_details.append("")
-                        elif exc_type == "missing_line_items":
-                            validation_details.append("Tool: content_validation_tool")
-                            validation_details.append("Field: line_items")
-                            validation_details.append("FAILED_RULE: content_completeness_validation")
-                            validation_details.append(f"INVOICE_VALUE: {exc.get('invoice_line_items_count', 0)} line items")
-                            validation_details.append(f"EXPECTED_VALUE: {exc.get('expected', 'At least 1 line item')}")
-                            validation_details.append("DIFFERENCE: N/A")
-                            validation_details.append(f"COMPARISON_METHOD: {exc.get('comparison_method', 'N/A')}")
-                            validation_details.append(f"THRESHOLD: {exc.get('threshold', 'N/A')}")
-                            validation_details.append(f"FAILURE_REASON: Missing required line items")
-                            validation_details.append("")
-                    else:
-                        # Legacy string format
-                        validation_details.append("Tool: content_validation_tool")
-                        validation_details.append("Field: content_match")
-                        validation_details.append("FAILED_RULE: content_validation")
-                        validation_details.append("INVOICE_VALUE: N/A")
-                        validation_details.append("EXPECTED_VALUE: N/A")
-                        validation_details.append("DIFFERENCE: N/A")
-                        validation_details.append(f"FAILURE_REASON: {str(exc)}")
-                        validation_details.append("")
-        
-        elif tool_name == "date_check_tool":
-            # Date issues - handle new detailed exception format
-            if exceptions:
-                for exc in exceptions:
-                    if isinstance(exc, dict):
-                        exc_type = exc.get("type", "")
-                        
-                        if exc_type == "invoice_issue_out_of_contract_window":
-                            validation_details.append("Tool: date_check_tool")
-                            validation_details.append("Field: issue_date")
-                            validation_details.append("FAILED_RULE: date_range_validation")
-                            validation_details.append(f"INVOICE_VALUE: {exc.get('invoice_issue_date', 'N/A')}")
-                            validation_details.append(f"EXPECTED_VALUE: {exc.get('expected_range', 'N/A')}")
-                            validation_details.append(f"DIFFERENCE: {exc.get('days_out_of_range', 'N/A')} days outside window")
-                            validation_details.append(f"COMPARISON_METHOD: {exc.get('comparison_method', 'N/A')}")
-                            validation_details.append(f"THRESHOLD: {exc.get('threshold', 'N/A')}")
-                            validation_details.append(f"FAILURE_REASON: Invoice issue date ({exc.get('invoice_issue_date', 'N/A')}) is outside contract window ({exc.get('expected_range', 'N/A')}) by {exc.get('days_out_of_range', 'N/A')} days")
-                            validation_details.append("")
-                        
-                        elif exc_type == "due_date_not_net30":
-                            validation_details.append("Tool: date_check_tool")
-                            validation_details.append("Field: due_date")
-                            validation_details.append("FAILED_RULE: payment_terms_validation")
-                            validation_details.append(f"INVOICE_VALUE: {exc.get('invoice_due_date', 'N/A')}")
-                            validation_details.append(f"EXPECTED_VALUE: {exc.get('expected_due_date', 'N/A')} (issue date + 30 days)")
-                            validation_details.append(f"DIFFERENCE: {exc.get('days_difference', 'N/A')} days")
-                            validation_details.append(f"COMPARISON_METHOD: {exc.get('comparison_method', 'N/A')}")
-                            validation_details.append(f"THRESHOLD: {exc.get('threshold', 'N/A')}")
-                            validation_details.append(f"FAILURE_REASON: Due date ({exc.get('invoice_due_date', 'N/A')}) should be Net 30 from issue date ({exc.get('invoice_issue_date', 'N/A')})")
-                            validation_details.append("")
-                        
-                        elif exc_type == "invoice_issue_before_po_effective_date":
-                            validation_details.append("Tool: date_check_tool")
-                            validation_details.append("Field: issue_date")
-                            validation_details.append("FAILED_RULE: po_date_validation")
-                            validation_details.append(f"INVOICE_VALUE: {exc.get('invoice_issue_date', 'N/A')}")
-                            validation_details.append(f"EXPECTED_VALUE: {exc.get('po_effective_date', 'N/A')} or later")
-                            validation_details.append(f"DIFFERENCE: {exc.get('days_before', 'N/A')} days before PO effective date")
-                            validation_details.append(f"COMPARISON_METHOD: {exc.get('comparison_method', 'N/A')}")
-                            validation_details.append(f"THRESHOLD: {exc.get('threshold', 'N/A')}")
-                            validation_details.append(f"FAILURE_REASON: Invoice issue date ({exc.get('invoice_issue_date', 'N/A')}) is {exc.get('days_before', 'N/A')} days before PO effective date ({exc.get('po_effective_date', 'N/A')})")
-                            validation_details.append("")
-                        
-                        elif "parse_error" in exc_type:
-                            validation_details.append("Tool: date_check_tool")
-                            validation_details.append("Field: date_parsing")
-                            validation_details.append("FAILED_RULE: date_format_validation")
-                            validation_details.append(f"INVOICE_VALUE: {exc.get('issue_date', exc.get('due_date', exc.get('effective_date', exc.get('end_date', 'N/A'))))}")
-                            validation_details.append(f"EXPECTED_VALUE: YYYY-MM-DD format")
-                            validation_details.append(f"DIFFERENCE: N/A")
-                            validation_details.append(f"COMPARISON_METHOD: format_validation")
-                            validation_details.append(f"THRESHOLD: {exc.get('required_format', 'YYYY-MM-DD')}")
-                            validation_details.append(f"FAILURE_REASON: Date parsing error: {exc.get('error', 'Unknown error')}")
-                            validation_details.append("")
-                    else:
-                        # Legacy string format
-                        validation_details.append("Tool: date_check_tool")
-                        validation_details.append("Field: date_validation")
-                        validation_details.append("FAILED_RULE: date_validation")
-                        validation_details.append("INVOICE_VALUE: N/A")
-                        validation_details.append("EXPECTED_VALUE: N/A")
-                        validation_details.append("DIFFERENCE: N/A")
-                        validation_details.append(f"FAILURE_REASON: {str(exc)}")
-                        validation_details.append("")
-        
-        elif tool_name == "currency_validation_tool":
-            # Currency validation issues - handle new detailed exception format
-            if exceptions:
-                for exc in exceptions:
-                    if isinstance(exc, dict):
-                        validation_details.append("Tool: currency_validation_tool")
-                        validation_details.append("Field: currency")
-                        validation_details.append(f"FAILED_RULE: {exc.get('type', 'currency_validation')}")
-                        validation_details.append(f"INVOICE_VALUE: {exc.get('invoice_currency', 'N/A')}")
-                        validation_details.append(f"EXPECTED_VALUE: {exc.get('supported_currencies', exc.get('contract_currency', exc.get('expected_format', 'N/A')))}")
-                        validation_details.append("DIFFERENCE: N/A")
-                        validation_details.append(f"COMPARISON_METHOD: {exc.get('comparison_method', 'N/A')}")
-                        validation_details.append(f"THRESHOLD: {exc.get('threshold', 'N/A')}")
-                        validation_details.append(f"FAILURE_REASON: {exc.get('type', 'Currency validation failed')} - {exc.get('invoice_currency', 'Unknown currency')}")
-                        validation_details.append("")
-                    else:
-                        # Legacy string format
-                        validation_details.append("Tool: currency_validation_tool")
-                        validation_details.append("Field: currency")
-                        validation_details.append("FAILED_RULE: currency_validation")
-                        validation_details.append("INVOICE_VALUE: Unknown")
-                        validation_details.append("EXPECTED_VALUE: USD")
-                        validation_details.append("DIFFERENCE: N/A")
-                        validation_details.append(f"FAILURE_REASON: {str(exc)}")
-                        validation_details.append("")
-        
-        elif tool_name == "payment_terms_validation_tool":
-            # Payment terms validation issues - handle new detailed exception format
-            if exceptions:
-                for exc in exceptions:
-                    if isinstance(exc, dict):
-                        validation_details.append("Tool: payment_terms_validation_tool")
-                        validation_details.append("Field: payment_terms")
-                        validation_details.append(f"FAILED_RULE: {exc.get('type', 'payment_terms_validation')}")
-                        validation_details.append(f"INVOICE_VALUE: {exc.get('invoice_terms', 'N/A')}")
-                        validation_details.append(f"EXPECTED_VALUE: {exc.get('supported_terms', exc.get('contract_terms', exc.get('expected_format', 'N/A')))}")
-                        validation_details.append("DIFFERENCE: N/A")
-                        validation_details.append(f"COMPARISON_METHOD: {exc.get('comparison_method', 'N/A')}")
-                        validation_details.append(f"THRESHOLD: {exc.get('threshold', 'N/A')}")
-                        validation_details.append(f"FAILURE_REASON: {exc.get('type', 'Payment terms validation failed')} - {exc.get('invoice_terms', 'Unknown terms')}")
-                        validation_details.append("")
-                    else:
-                        # Legacy string format
-                        validation_details.append("Tool: payment_terms_validation_tool")
-                        validation_details.append("Field: payment_terms")
-                        validation_details.append("FAILED_RULE: payment_terms_validation")
-                        validation_details.append("INVOICE_VALUE: Unknown")
-                        validation_details.append("EXPECTED_VALUE: Net 30")
-                        validation_details.append("DIFFERENCE: N/A")
-                        validation_details.append(f"FAILURE_REASON: {str(exc)}")
-                        validation_details.append("")
+        handler = _VALIDATION_DETAIL_HANDLERS.get(tool_result.get("tool", "unknown_tool"))
+        if handler is not None:
+            handler(tool_result.get("exceptions") or (), invoice_data, contract_data, po_item, validation_details)
     
-    return "\n".join(validation_details)
+    return validation_details
+
+
+# Map queue names to exception types
+_EXCEPTION_TYPE_MAP = {
+    "missing_data": "MISSING_DATA",
+    "low_confidence_matches": "LOW_CONFIDENCE",
+    "price_discrepancies": "PRICE_DISCREPANCY",
+    "supplier_mismatch": "SUPPLIER_MISMATCH",
+    "billing_discrepancies": "BILLING_DISCREPANCY",
+    "date_discrepancies": "DATE_DISCREPANCY",
+    "high_value_approval": "HIGH_VALUE_APPROVAL",
+    "general_exceptions": "GENERAL"
+}
+
+# Constant tail of every canonical exception entry (follows the CONTEXT lines)
+_EXCEPTION_ENTRY_TRAILER = """
+
+SUGGESTED_ACTIONS:
+  - Review the specific issues listed above
+  - Contact supplier if data discrepancies found
+  - Verify PO and contract details if matching issues
+  - Approve manually if all checks pass after review
+
+METADATA:
+  tool_version: 1.0.0
+  system_version: 2.1.0
+  processing_time: N/A
+=== EXCEPTION_END ==="""
+
+
+def _low_confidence_context(queue_info: Dict[str, Any], tool_results: List[Dict[str, Any]], amount: float) -> List[str]:
+    return [
+        "MATCHING CONFIDENCE:",
+        f"  - Overall confidence: {queue_info.get('confidence_score', 0):.1%}",
+        "  - Review matching logic and consider manual verification",
+    ]
+
+
+def _price_discrepancy_context(queue_info: Dict[str, Any], tool_results: List[Dict[str, Any]], amount: float) -> List[str]:
+    context_details = []
+    line_item_tool = next((r for r in tool_results if r.get("tool") == "line_item_validation_tool"), None)
+    if line_item_tool:
+        context_details.append("LINE ITEM DISCREPANCIES:")
+        for exc in line_item_tool.get("exceptions", []):
+            if exc.get("discrepancies"):
+                context_details.append(f"  - Item {exc.get('item_id')}: {exc.get('description')}")
+                for disc in exc.get("discrepancies", []):
+                    if disc.get("status") == "FAIL":
+                        context_details.append(f"    * {disc.get('field')}: {disc.get('invoice_value')} vs PO {disc.get('po_value')}")
+    return context_details
+
+
+def _billing_context(queue_info: Dict[str, Any], tool_results: List[Dict[str, Any]], amount: float) -> List[str]:
+    context_details = []
+    billing_tool = next((r for r in tool_results if r.get("tool") == "simple_overbilling_tool"), None)
+    if billing_tool:
+        context_details.append("BILLING ISSUES:")
+        for exc in billing_tool.get("exceptions", []):
+            context_details.append(f"  - {exc}")
+    return context_details
+
 
+def _high_value_context(queue_info: Dict[str, Any], tool_results: List[Dict[str, Any]], amount: float) -> List[str]:
+    return [
+        "HIGH VALUE INVOICE:",
+        f"  - Invoice amount: ${amount:,.2f}",
+        "  - Requires manager approval due to high value",
+    ]
 
-def _create_queue_specific_log_entry(queue_info: Dict[str, Any], invoice_data: Dict[str, Any], exception_id: str, tool_results: List[Dict[str, Any]], contract_data: Dict[str, Any] = None, po_item: Dict[str, Any] = None) -> str:
+
+def _general_context(queue_info: Dict[str, Any], tool_results: List[Dict[str, Any]], amount: float) -> List[str]:
+    return ["  - General validation failure"]
+
+
+def _supplier_mismatch_context(queue_info: Dict[str, Any], tool_results: List[Dict[str, Any]], amount: float) -> List[str]:
+    return [
+        "SUPPLIER MISMATCH:",
+        "  - Supplier information mismatch",
+        "  - Verify supplier details and PO matching",
+    ]
+
+
+def _date_context(queue_info: Dict[str, Any], tool_results: List[Dict[str, Any]], amount: float) -> List[str]:
+    return [
+        "DATE ISSUES:",
+        "  - Date validation failed",
+        "  - Check invoice dates, payment terms, and PO dates",
+    ]
+
+
+def _missing_data_context(queue_info: Dict[str, Any], tool_results: List[Dict[str, Any]], amount: float) -> List[str]:
+    return [
+        "MISSING DATA:",
+        "  - Required PO or contract data not found",
+        "  - Verify data availability and matching criteria",
+    ]
+
+
+# Queue name -> builder of the CONTEXT lines of its log entry (anything else: _general_context)
+_CONTEXT_BUILDERS: Dict[str, Callable[[Dict[str, Any], List[Dict[str, Any]], float], List[str]]] = {
+    "low_confidence_matches": _low_confidence_context,
+    "price_discrepancies": _price_discrepancy_context,
+    "billing_discrepancies": _billing_context,
+    "supplier_mismatch": _supplier_mismatch_context,
+    "date_discrepancies": _date_context,
+    "high_value_approval": _high_value_context,
+    "missing_data": _missing_data_context,
+}
+
+
+def _create_queue_specific_log_entry(queue_info: Dict[str, Any], invoice_data: Dict[str, Any], exception_id: str, tool_results: List[Dict[str, Any]], contract_data: Dict[str, Any] = None, po_item: Dict[str, Any] = None, amount: float = None, ts: str = None) -> str:
     """
     Create a queue-specific log entry in canonical format for human reviewers.
+    amount is the invoice billing amount, when the caller has already parsed it;
+    ts the entry timestamp (defaults to now).
     """
     queue_name = queue_info["queue_name"]
     priority = queue_info["priority"]
@@ -614,75 +992,20 @@ def _create_queue_specific_log_entry(queue_info: Dict[str, Any], invoice_data: D
     
     inv_id = invoice_data.get("invoice_id", "<unknown>")
     po_num = invoice_data.get("purchase_order_number", "<unknown>")
-    amount = float(invoice_data.get("summary", {}).get("billing_amount", 0))
+    if amount is None:
+        amount = _invoice_amount(invoice_data)
     # Handle both supplier and supplier_info structures
     supplier_info = invoice_data.get("supplier_info", invoice_data.get("supplier", {}))
     supplier = supplier_info.get("name", "<unknown>")
     
-    # Map queue names to exception types
-    exception_type_map = {
-        "missing_data": "MISSING_DATA",
-        "low_confidence_matches": "LOW_CONFIDENCE", 
-        "price_discrepancies": "PRICE_DISCREPANCY",
-        "supplier_mismatch": "SUPPLIER_MISMATCH",
-        "billing_discrepancies": "BILLING_DISCREPANCY",
-        "date_discrepancies": "DATE_DISCREPANCY",
-        "high_value_approval": "HIGH_VALUE_APPROVAL",
-        "general_exceptions": "GENERAL"
-    }
-    exception_type = exception_type_map.get(queue_name, "GENERAL")
+    exception_type = _EXCEPTION_TYPE_MAP.get(queue_name, "GENERAL")
     
     # Generate validation details  
     validation_details = _generate_validation_details(tool_results, invoice_data, contract_data, po_item)
     
     # Create detailed context based on queue type
-    context_details = []
-    
-    if queue_name == "low_confidence_matches":
-        context_details.append("MATCHING CONFIDENCE:")
-        context_details.append(f"  - Overall confidence: {queue_info.get('confidence_score', 0):.1%}")
-        context_details.append("  - Review matching logic and consider manual verification")
-    
-    elif queue_name == "price_discrepancies":
-        line_item_tool = next((r for r in tool_results if r.get("tool") == "line_item_validation_tool"), None)
-        if line_item_tool:
-            context_details.append("LINE ITEM DISCREPANCIES:")
-            for exc in line_item_tool.get("exceptions", []):
-                if exc.get("discrepancies"):
-                    context_details.append(f"  - Item {exc.get('item_id')}: {exc.get('description')}")
-                    for disc in exc.get("discrepancies", []):
-                        if disc.get("status") == "FAIL":
-                            context_details.append(f"    * {disc.get('field')}: {disc.get('invoice_value')} vs PO {disc.get('po_value')}")
-    
-    elif queue_name == "billing_discrepancies":
-        billing_tool = next((r for r in tool_results if r.get("tool") == "simple_overbilling_tool"), None)
-        if billing_tool:
-            context_details.append("BILLING ISSUES:")
-            for exc in billing_tool.get("exceptions", []):
-                context_details.append(f"  - {exc}")
-    
-    elif queue_name == "supplier_mismatch":
-        context_details.append("SUPPLIER MISMATCH:")
-        context_details.append("  - Supplier information mismatch")
-        context_details.append("  - Verify supplier details and PO matching")
-    
-    elif queue_name == "date_discrepancies":
-        context_details.append("DATE ISSUES:")
-        context_details.append("  - Date validation failed")
-        context_details.append("  - Check invoice dates, payment terms, and PO dates")
-    
-    elif queue_name == "high_value_approval":
-        context_details.append("HIGH VALUE INVOICE:")
-        context_details.append(f"  - Invoice amount: ${amount:,.2f}")
-        context_details.append("  - Requires manager approval due to high value")
-    
-    elif queue_name == "missing_data":
-        context_details.append("MISSING DATA:")
-        context_details.append("  - Required PO or contract data not found")
-        context_details.append("  - Verify data availability and matching criteria")
-    
-    else:  # general_exceptions
-        context_details.append("  - General validation failure")
+    build_context = _CONTEXT_BUILDERS.get(queue_name, _general_context)
+    context_details = build_context(queue_info, tool_results, amount)
     
     # Create canonical format log entry
     log_entry = f"""=== EXCEPTION_START ===
@@ -692,7 +1015,7 @@ STATUS: REJECTED
 QUEUE: {queue_name}
 PRIORITY: {priority.upper()}
 EXCEPTION_TYPE: {exception_type}
-TIMESTAMP: {_ts()}
+TIMESTAMP: {ts or _ts()}
 INVOICE_ID: {inv_id}
 PO_NUMBER: {po_num}
 AMOUNT: ${amount:,.2f}
@@ -702,27 +1025,89 @@ CONFIDENCE_SCORE: {queue_info.get('confidence_score', 'N/A')}
 MANAGER_APPROVAL_REQUIRED: {'YES' if queue_info.get('requires_manager_approval', False) else 'NO'}
 """
     
+    parts = [log_entry]
     # Add VALIDATION_DETAILS section if available
     if validation_details:
-        log_entry += f"\nVALIDATION_DETAILS:\n{validation_details}\n"
+        parts.append("\nVALIDATION_DETAILS:\n")
+        parts.append("\n".join(validation_details))
+        parts.append("\n")
+    parts.append("\nCONTEXT:\n")
+    parts.append("\n".join(context_details))
+    parts.append(_EXCEPTION_ENTRY_TRAILER)
     
-    log_entry += f"""
-CONTEXT:
-{chr(10).join(context_details)}
+    return "".join(parts)
 
-SUGGESTED_ACTIONS:
-  - Review the specific issues listed above
-  - Contact supplier if data discrepancies found
-  - Verify PO and contract details if matching issues
-  - Approve manually if all checks pass after review
 
-METADATA:
-  tool_version: 1.0.0
-  system_version: 2.1.0
-  processing_time: N/A
-=== EXCEPTION_END ==="""
-    
-    return log_entry
+# What triage reads from one resolution and validation run:
+# (invoice, po_item, contract, matching_details, validation, tool_results)
+_PipelineResult = Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any], Dict[str, Any], Optional[str], Tuple[Dict[str, Any], ...]]
+
+
+def _run_pipeline(invoice_filename: str, root: str) -> _PipelineResult:
+    # Independent of each other: validate on a worker while this thread resolves
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        validation = pool.submit(run_validations, invoice_filename, repo_root=root)
+        resolution = fuzzy_resolve_invoice_to_po_and_contract(invoice_filename, repo_root=root)
+        report = validation.result()
+    invoice = resolution.get("invoice")
+    po_item = resolution.get("po_item")
+    contract = resolution.get("contract")
+    return (
+        invoice if isinstance(invoice, dict) else {},
+        po_item if isinstance(po_item, dict) else {},
+        contract if isinstance(contract, dict) else {},
+        resolution.get("matching_details", {}),
+        report.get("validation"),
+        tuple(report.get("tool_results") or ()),
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _run_pipeline_cached(invoice_filename: str, root: str, state: Tuple[Any, ...]) -> _PipelineResult:
+    # state only keys the cache: see _pipeline_state
+    return _run_pipeline(invoice_filename, root)
+
+
+def _pipeline_state(invoice_filename: str, root: str) -> Optional[Tuple[Any, ...]]:
+    """
+    Everything the resolution and validation of an invoice read: the invoice
+    file's (path, mtime_ns, size) and the signature of every PO and contract
+    directory either of them searches. None if the invoice cannot be found
+    (nothing worth caching).
+    """
+    invoice_dirs, po_dirs, contract_dirs = resolve_directories(
+        root,
+        fixed_po_dir=os.path.join(root, "json_files", "POs"),
+        fixed_contract_dir=os.path.join(root, "json_files", "contracts")
+    )
+    invoice_path = find_invoice_path(invoice_filename, invoice_dirs)
+    if not invoice_path:
+        return None
+    try:
+        st = os.stat(invoice_path)
+    except OSError:
+        return None
+    # The fuzzy resolver searches the dirs found above; the exact resolver always reads json_files/*
+    po_dirs = list(dict.fromkeys([*po_dirs, os.path.join(root, "json_files", "POs")]))
+    contract_dirs = list(dict.fromkeys([*contract_dirs, os.path.join(root, "json_files", "contracts")]))
+    return (
+        (invoice_path, st.st_mtime_ns, st.st_size),
+        _json_files_signature(po_dirs),
+        _json_files_signature(contract_dirs),
+    )
+
+
+def _resolve_and_validate(invoice_filename: str, root: str) -> _PipelineResult:
+    """
+    Resolved invoice, PO item, contract and matching details, validation verdict
+    and tool results of an invoice. Memoized while the invoice file and the PO
+    and contract files are unchanged (clear with _run_pipeline_cached.cache_clear());
+    only triage reads them, and it never modifies them, so they are shared uncopied.
+    """
+    state = _pipeline_state(invoice_filename, root)
+    if state is None:
+        return _run_pipeline(invoice_filename, root)
+    return _run_pipeline_cached(invoice_filename, root, state)
 
 
 def triage_and_route(invoice_filename: str, repo_root: str | None = None) -> Dict[str, Any]:
@@ -753,27 +1138,22 @@ def triage_and_route(invoice_filename: str, repo_root: str | None = None) -> Dic
     #     pass
     
     # Step 2: Use fuzzy matching for better resolution
-    resolution = fuzzy_resolve_invoice_to_po_and_contract(invoice_filename, repo_root=root)
-    invoice = resolution.get("invoice") if isinstance(resolution.get("invoice"), dict) else {}
-    po_item = resolution.get("po_item") if isinstance(resolution.get("po_item"), dict) else {}
-    contract = resolution.get("contract") if isinstance(resolution.get("contract"), dict) else {}
-    matching_details = resolution.get("matching_details", {})
-    
-    # Step 3: Run comprehensive validation
-    report = run_validations(invoice_filename, repo_root=root)
-    validation = report.get("validation")
-    tool_results = report.get("tool_results") or []
+    # Step 3: Run comprehensive validation (both reused while the files are unchanged)
+    invoice, po_item, contract, matching_details, validation, tool_results = _resolve_and_validate(invoice_filename, root)
     
     actions: List[str] = []
+    # Parsed once; used for routing and in the queue log entry
+    invoice_amount = _invoice_amount(invoice)
+    # One timestamp for every record this triage writes
+    now = _ts()
     
     if validation == "PASS":
         # Check if we need manager approval for high-value invoices
-        invoice_amount = float(invoice.get("summary", {}).get("billing_amount", 0))
         overall_confidence = matching_details.get("overall_confidence", 1.0)
         
         if invoice_amount > 10000 or overall_confidence < 0.9:
             # Route to high-value approval queue even if validation passes
-            exception_id = f"EXC-{uuid.uuid4().hex[:12].upper()}"
+            exception_id = _new_exception_id()
             queue_info = {
                 "queue_name": "high_value_approval",
                 "priority": "high",
@@ -782,8 +1162,8 @@ def triage_and_route(invoice_filename: str, repo_root: str | None = None) -> Dic
             }
             
             # High-value approval logging
-            approval_log = os.path.join(logs_dir, "queue_high_value_approval.log")
-            log_entry = _create_queue_specific_log_entry(queue_info, invoice, exception_id, tool_results, contract, po_item)
+            approval_log = _log_path(logs_dir, "queue_high_value_approval.log")
+            log_entry = _create_queue_specific_log_entry(queue_info, invoice, exception_id, tool_results, contract, po_item, invoice_amount, now)
             _append_line(approval_log, log_entry)
             
             # Log to processed_invoices.log for audit trail
@@ -793,7 +1173,7 @@ def triage_and_route(invoice_filename: str, repo_root: str | None = None) -> Dic
                 "priority": "high",
                 "requires_manager_approval": True
             }
-            _log_processed_invoice(invoice, "PENDING_APPROVAL", logs_dir, additional_info)
+            _log_processed_invoice(invoice, "PENDING_APPROVAL", logs_dir, additional_info, now, invoice_amount)
             
             return {
                 "status": "PENDING_APPROVAL",
@@ -808,23 +1188,20 @@ def triage_and_route(invoice_filename: str, repo_root: str | None = None) -> Dic
             inv_id = invoice.get("invoice_id", "<unknown>")
             po_num = invoice.get("purchase_order_number", "<unknown>")
             
-            payments_log = os.path.join(logs_dir, "payments.log")
-            _append_line(payments_log, f"[INFO] [{_ts()}] Invoice {inv_id} approved. Routing to Payment System.")
-            
-            # Log each line item as approved payment
-            for li in invoice.get("line_items", []) or []:
-                item_id = li.get("item_id")
-                desc = li.get("description")
-                total = li.get("line_total")
-                _append_line(
-                    payments_log,
-                    f"    payment_item: invoice_id={inv_id}, po_number={po_num}, item_id={item_id}, description={desc}, amount={total}"
-                )
+            payments_log = _log_path(logs_dir, "payments.log")
+            # Approval line, then each line item as approved payment, in one write
+            _append_lines(payments_log, chain(
+                (f"[INFO] [{now}] Invoice {inv_id} approved. Routing to Payment System.",),
+                (
+                    f"    payment_item: invoice_id={inv_id}, po_number={po_num}, item_id={li.get('item_id')}, description={li.get('description')}, amount={li.get('line_total')}"
+                    for li in invoice.get("line_items", []) or []
+                ),
+            ))
             
             actions.append("APPROVED → Payments logged")
             
             # Log to processed_invoices.log for audit trail
-            _log_processed_invoice(invoice, "APPROVED", logs_dir)
+            _log_processed_invoice(invoice, "APPROVED", logs_dir, ts=now, amount=invoice_amount)
             
             return {
                 "status": "APPROVED",
@@ -834,21 +1211,21 @@ def triage_and_route(invoice_filename: str, repo_root: str | None = None) -> Dic
     
     # Step 4: Handle validation failures with granular routing
     inv_id = invoice.get("invoice_id", "<unknown>")
-    exception_id = f"EXC-{uuid.uuid4().hex[:12].upper()}"
+    exception_id = _new_exception_id()
     
     # Determine routing queue based on failure types
-    queue_info = _determine_routing_queue(tool_results, invoice, matching_details)
+    queue_info = _determine_routing_queue(tool_results, invoice, matching_details, invoice_amount)
     queue_name = queue_info["queue_name"]
     priority = queue_info["priority"]
     
     # Create queue-specific log file
-    queue_log = os.path.join(logs_dir, f"queue_{queue_name}.log")
-    log_entry = _create_queue_specific_log_entry(queue_info, invoice, exception_id, tool_results, contract, po_item)
+    queue_log = _log_path(logs_dir, f"queue_{queue_name}.log")
+    log_entry = _create_queue_specific_log_entry(queue_info, invoice, exception_id, tool_results, contract, po_item, invoice_amount, now)
     _append_line(queue_log, log_entry)
     
     # Also log to general exceptions ledger for audit trail
-    exceptions_log = os.path.join(logs_dir, "exceptions_ledger.log")
-    _append_line(exceptions_log, f"[EXCEPTION] [{_ts()}] id={exception_id} status=REJECTED type=VALIDATION_FAILED invoice_id={inv_id} queue={queue_name}")
+    exceptions_log = _log_path(logs_dir, "exceptions_ledger.log")
+    _append_line(exceptions_log, f"[EXCEPTION] [{now}] id={exception_id} status=REJECTED type=VALIDATION_FAILED invoice_id={inv_id} queue={queue_name}")
     
     # Log rejection for audit trail
     
@@ -860,7 +1237,7 @@ def triage_and_route(invoice_filename: str, repo_root: str | None = None) -> Dic
         "requires_manager_approval": queue_info["requires_manager_approval"],
         "routing_reason": queue_info["routing_reason"]
     }
-    _log_processed_invoice(invoice, "REJECTED", logs_dir, additional_info)
+    _log_processed_invoice(invoice, "REJECTED", logs_dir, additional_info, now, invoice_amount)
     
     actions.append(f"REJECTED → Routed to {queue_name} queue")
     return {